@@ -0,0 +1,94 @@
+"""Benchmarks for creating `FakeUserAgent` instances and getting user agents from them."""
+
+import tracemalloc
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fake_useragent import UserAgent  # noqa: E402
+from fake_useragent.utils import get_shared_data  # noqa: E402
+
+FILTERS = {
+    "default": {},
+    "browsers": {"browsers": ["Chrome", "Firefox", "Safari"]},
+    "os": {"os": ["Windows", "Mac OS X"]},
+    "platforms": {"platforms": "mobile"},
+    "min_version": {"min_version": 120.0},
+    "min_percentage": {"min_percentage": 0.01},
+    "combined": {
+        "browsers": ["Chrome", "Edge"],
+        "os": "Windows",
+        "platforms": "desktop",
+        "min_version": 120.0,
+    },
+}
+
+
+@pytest.fixture(scope="module", autouse=True)
+def shared_data():
+    # Load the shared data up front, so it is not part of the first measured round.
+    return get_shared_data()
+
+
+def _create(filters):
+    ua = UserAgent(**filters)
+    ua.warmup()
+    return ua
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def test_bench_create(benchmark, filters):
+    ua = benchmark(_create, filters)
+    assert ua.random
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def test_bench_instance_memory(benchmark, filters):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        ua = _create(filters)
+        ua.random  # noqa: B018
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # Memory allocated by a single instance on top of the shared data, in bytes.
+    benchmark.extra_info["instance_bytes"] = after - before
+
+    assert benchmark(_create, filters)
+
+
+@pytest.mark.parametrize("filters", FILTERS.values(), ids=FILTERS.keys())
+def test_bench_filter_useragents(benchmark, filters):
+    ua = _create(filters)
+    assert benchmark(ua._filter_useragents)
+
+
+@pytest.mark.parametrize("weighted", [False, True], ids=["uniform", "weighted"])
+def test_bench_random(benchmark, weighted):
+    ua = _create({"weighted": weighted})
+    assert benchmark(getattr, ua, "random")
+
+
+@pytest.mark.parametrize("weighted", [False, True], ids=["uniform", "weighted"])
+def test_bench_chrome(benchmark, weighted):
+    ua = _create({"weighted": weighted})
+    assert benchmark(getattr, ua, "chrome")
+
+
+def test_bench_get_browser(benchmark):
+    ua = _create({})
+    assert benchmark(ua.getBrowser, "Firefox")
+
+
+def test_bench_random_thread_local(benchmark):
+    ua = _create({"thread_local": True})
+    assert benchmark(getattr, ua, "random")
+
+
+@pytest.mark.parametrize("weighted", [False, True], ids=["uniform", "weighted"])
+def test_bench_sample(benchmark, weighted):
+    count = 10_000
+    ua = _create({"weighted": weighted})
+    assert len(benchmark(ua.sample, count)) == count
@@ -0,0 +1,91 @@
+"""Benchmarks for importing the package and loading the shipped user agent data."""
+
+import json
+import subprocess
+import sys
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fake_useragent import dataset, packed, utils  # noqa: E402
+
+COLD_START = """
+import fake_useragent
+
+fake_useragent.UserAgent().random
+try:
+    import resource
+except ImportError:
+    print(0)
+else:
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def _cold_start():
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return int(result.stdout)
+
+
+def test_bench_cold_start(benchmark):
+    max_rss = benchmark.pedantic(_cold_start, rounds=5, warmup_rounds=1)
+    # Maximum resident set size of the process, in KiB on Linux and in bytes on macOS.
+    benchmark.extra_info["max_rss"] = max_rss
+
+
+def test_bench_import(benchmark):
+    code = "import fake_useragent"
+    benchmark.pedantic(
+        subprocess.run,
+        args=([sys.executable, "-c", code],),
+        kwargs={"check": True},
+        rounds=5,
+        warmup_rounds=1,
+    )
+
+
+def test_bench_load(benchmark):
+    data = benchmark(utils.load)
+    assert data
+
+
+def test_bench_load_json(benchmark):
+    with mock.patch.object(
+        utils,
+        "find_browser_packed_path",
+        return_value=utils.find_browser_json_path().with_suffix(".missing"),
+    ):
+        data = benchmark(utils.load)
+    assert data
+
+
+def test_bench_parse_json(benchmark):
+    text = utils.find_browser_json_path().read_text()
+
+    def parse():
+        return [json.loads(line) for line in text.splitlines()]
+
+    assert benchmark(parse)
+
+
+def test_bench_unpack(benchmark):
+    buffer = utils.find_browser_packed_path().read_bytes()
+    data = benchmark(packed.unpack, buffer)
+    assert data.count
+
+
+def test_bench_load_dataset(benchmark):
+    data = benchmark(dataset.load_dataset)
+    assert len(data)
+
+
+def test_bench_mapped_dataset(benchmark):
+    data = benchmark(dataset.MappedDataset)
+    assert len(data)
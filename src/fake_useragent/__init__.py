@@ -1,10 +1,12 @@
 """Up-to-date simple useragent faker with real world database."""
 
+from fake_useragent.aio import AsyncUserAgent
 from fake_useragent.errors import FakeUserAgentError, UserAgentError
 from fake_useragent.fake import FakeUserAgent, UserAgent
 from fake_useragent.get_version import __version__
 
 __all__ = [
+    "AsyncUserAgent",
     "FakeUserAgent",
     "UserAgent",
     "FakeUserAgentError",
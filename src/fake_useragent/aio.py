@@ -0,0 +1,68 @@
+"""Fake User Agent retriever for asyncio applications."""
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any, Union
+
+from fake_useragent.fake import FakeUserAgent
+
+
+class AsyncUserAgent(FakeUserAgent):
+    """Fake User Agent retriever that loads its data without blocking the event loop.
+
+    Loading the user agent data reads and parses a data file, which would block the event loop
+    if it happened on the first request for a user agent. Create instances with `create()` (or
+    call `awarmup()`) to load the data in an executor instead. Afterwards, the regular
+    `FakeUserAgent` API (`random`, `chrome`, `getBrowser()`, ...) never blocks.
+
+    Accepts the same arguments as `FakeUserAgent`.
+    """
+
+    @classmethod
+    async def create(cls, *args: Any, **kwargs: Any) -> "AsyncUserAgent":
+        """Create an instance and load its data in an executor.
+
+        Args:
+            *args (Any): Positional arguments for `FakeUserAgent`.
+            **kwargs (Any): Keyword arguments for `FakeUserAgent`.
+
+        Returns:
+            AsyncUserAgent: The instance, ready to use.
+        """
+        ua = cls(*args, **kwargs)
+        await ua.awarmup()
+        return ua
+
+    async def awarmup(self) -> None:
+        """Load the user agent data and build the filter index in the default executor.
+
+        Raises:
+            FakeUserAgentError: If unable to load or parse the data.
+        """
+        if self._dataset is None:
+            await asyncio.get_running_loop().run_in_executor(None, self.warmup)
+
+    async def stream(
+        self, browsers: Union[str, list[str]] = "random"
+    ) -> AsyncIterator[str]:
+        """Yield an endless stream of user agent strings, for example one per request.
+
+        Args:
+            browsers (Union[str, list[str]], optional): The browser name(s) to get. Special
+                keyword "random" will return user agents from any browser allowed by the
+                instance. Defaults to "random".
+
+        Yields:
+            str: A random user agent string.
+        """
+        await self.awarmup()
+        while True:
+            yield self._get_useragent(browsers)
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        """Iterate over an endless stream of random user agent strings.
+
+        Returns:
+            AsyncIterator[str]: The stream, see `stream()`.
+        """
+        return self.stream()
@@ -0,0 +1,668 @@
+"""Datasets holding the browser user agent records `FakeUserAgent` picks from."""
+
+import json
+import mmap
+import os
+from abc import abstractmethod
+from array import array
+from collections.abc import Collection, Iterable, Sequence
+from pathlib import Path
+from typing import Any, BinaryIO, Optional, Union
+
+from fake_useragent.errors import FakeUserAgentError
+from fake_useragent.packed import (
+    FIELDS,
+    FLOAT_FIELDS,
+    MAGIC,
+    NULL,
+    STRING_FIELDS,
+    UINT32_TYPECODE,
+    PackedData,
+    pack,
+    unpack,
+)
+from fake_useragent.utils import (
+    BrowserUserAgentData,
+    _load_packed,
+    _packed_up_to_date,
+    find_browser_json_path,
+    find_browser_packed_path,
+    load,
+)
+
+
+class Dataset(Sequence[BrowserUserAgentData]):
+    """Base class for a read-only sequence of browser user agent records.
+
+    Records are addressed by their index. Besides materialising whole records, a dataset can
+    filter records and return single fields, so `FakeUserAgent` only needs whole records when
+    the user asks for them.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Get the number of records.
+
+        Returns:
+            int: The number of records in the dataset.
+        """
+
+    @abstractmethod
+    def __getitem__(self, idx: int) -> BrowserUserAgentData:  # type: ignore[override]
+        """Get a single record.
+
+        Args:
+            idx (int): The index of the record.
+
+        Returns:
+            BrowserUserAgentData: The record.
+        """
+
+    def useragent(self, idx: int) -> str:
+        """Get the user agent string of a single record.
+
+        Args:
+            idx (int): The index of the record.
+
+        Returns:
+            str: The user agent string.
+        """
+        return self[idx]["useragent"]
+
+    def to_list(self) -> list[BrowserUserAgentData]:
+        """Get all records as a list of dictionaries.
+
+        The list is materialised on the first call and then reused, so it must be treated as
+        read-only.
+
+        Returns:
+            list[BrowserUserAgentData]: All records, in order.
+        """
+        records = self.__dict__.get("_list")
+        if records is None:
+            records = self.__dict__["_list"] = self._materialise()
+        return records
+
+    def _materialise(self) -> list[BrowserUserAgentData]:
+        """Create the list returned by `to_list`.
+
+        Returns:
+            list[BrowserUserAgentData]: All records, in order.
+        """
+        return list(self)
+
+    @abstractmethod
+    def values(self, field: str, indices: Iterable[int]) -> list[Any]:
+        """Get a single field of the given records.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+            indices (Iterable[int]): The indices of the records.
+
+        Returns:
+            list[Any]: The field values, in the order of `indices`.
+        """
+
+    def distinct(self, field: str) -> set[Any]:
+        """Get the distinct values of a field over all records.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+
+        Returns:
+            set[Any]: The distinct values.
+        """
+        return set(self.values(field, range(len(self))))
+
+    @abstractmethod
+    def select(
+        self,
+        browsers: Collection[str],
+        os: Collection[str],
+        types: Collection[str],
+        min_version: float,
+        min_percentage: float,
+    ) -> list[int]:
+        """Find the records matching all the given filters.
+
+        Args:
+            browsers (Collection[str]): Allowed browser names.
+            os (Collection[str]): Allowed operating system names.
+            types (Collection[str]): Allowed device types (eg. desktop).
+            min_version (float): Minimum major and minor browser version.
+            min_percentage (float): Minimum usage percentage.
+
+        Returns:
+            list[int]: The indices of the matching records, in ascending order.
+        """
+
+
+class RecordDataset(Dataset):
+    """Dataset backed by a sequence of record dictionaries.
+
+    Args:
+        records (Sequence[BrowserUserAgentData]): The records, following the
+            `BrowserUserAgentData` schema.
+    """
+
+    def __init__(self, records: Sequence[BrowserUserAgentData]):
+        self.records = records
+
+    def __len__(self) -> int:
+        """Get the number of records.
+
+        Returns:
+            int: The number of records in the dataset.
+        """
+        return len(self.records)
+
+    def __getitem__(self, idx: int) -> BrowserUserAgentData:  # type: ignore[override]
+        """Get a single record.
+
+        Args:
+            idx (int): The index of the record.
+
+        Returns:
+            BrowserUserAgentData: The record.
+        """
+        return self.records[idx]
+
+    def _materialise(self) -> list[BrowserUserAgentData]:
+        """Create the list returned by `to_list`, reusing the records list if possible.
+
+        Returns:
+            list[BrowserUserAgentData]: All records, in order.
+        """
+        if isinstance(self.records, list):
+            return self.records
+        return list(self.records)
+
+    def values(self, field: str, indices: Iterable[int]) -> list[Any]:
+        """Get a single field of the given records.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+            indices (Iterable[int]): The indices of the records.
+
+        Returns:
+            list[Any]: The field values, in the order of `indices`.
+        """
+        records = self.records
+        return [records[idx][field] for idx in indices]  # type: ignore[literal-required]
+
+    def select(
+        self,
+        browsers: Collection[str],
+        os: Collection[str],
+        types: Collection[str],
+        min_version: float,
+        min_percentage: float,
+    ) -> list[int]:
+        """Find the records matching all the given filters.
+
+        Args:
+            browsers (Collection[str]): Allowed browser names.
+            os (Collection[str]): Allowed operating system names.
+            types (Collection[str]): Allowed device types (eg. desktop).
+            min_version (float): Minimum major and minor browser version.
+            min_percentage (float): Minimum usage percentage.
+
+        Returns:
+            list[int]: The indices of the matching records, in ascending order.
+        """
+        return [
+            idx
+            for idx, x in enumerate(self.records)
+            if x["browser"] in browsers
+            and x["os"] in os
+            and x["type"] in types
+            and x["browser_version_major_minor"] >= min_version
+            and x["percent"] >= min_percentage
+        ]
+
+
+class _PackedDataset(Dataset):
+    """Base class for datasets backed by the columns of a packed file (see `fake_useragent.packed`).
+
+    String fields are stored as small integer codes into a table of distinct strings, so filters
+    compare integers and every distinct string exists only once.
+
+    Args:
+        count (int): The number of records.
+        columns (dict[str, Sequence]): A float column per field in
+            `fake_useragent.packed.FLOAT_FIELDS` and a code column per field in
+            `fake_useragent.packed.STRING_FIELDS`.
+    """
+
+    def __init__(self, count: int, columns: dict[str, Sequence]):
+        self._count = count
+        self._columns = columns
+
+    @abstractmethod
+    def _string(self, code: int) -> Optional[str]:
+        """Get a string of the string table.
+
+        Args:
+            code (int): The string code.
+
+        Returns:
+            Optional[str]: The string, or None for the `NULL` code.
+        """
+
+    def __len__(self) -> int:
+        """Get the number of records.
+
+        Returns:
+            int: The number of records in the dataset.
+        """
+        return self._count
+
+    def __getitem__(self, idx: int) -> BrowserUserAgentData:  # type: ignore[override]
+        """Get a single record, materialising it from the columns.
+
+        Args:
+            idx (int): The index of the record.
+
+        Raises:
+            IndexError: If the index is out of range.
+
+        Returns:
+            BrowserUserAgentData: The record.
+        """
+        if not -self._count <= idx < self._count:
+            raise IndexError("dataset index out of range")
+        columns = self._columns
+        return {
+            "useragent": self.useragent(idx),
+            "percent": columns["percent"][idx],
+            "type": self._string(columns["type"][idx]),
+            "device_brand": self._string(columns["device_brand"][idx]),
+            "browser": self._string(columns["browser"][idx]),
+            "browser_version": self._string(columns["browser_version"][idx]),
+            "browser_version_major_minor": columns["browser_version_major_minor"][idx],
+            "os": self._string(columns["os"][idx]),
+            "os_version": self._string(columns["os_version"][idx]),
+            "platform": self._string(columns["platform"][idx]),
+        }  # type: ignore[typeddict-item]
+
+    def useragent(self, idx: int) -> str:
+        """Get the user agent string of a single record.
+
+        Args:
+            idx (int): The index of the record.
+
+        Returns:
+            str: The user agent string.
+        """
+        return self._string(self._columns["useragent"][idx])  # type: ignore[return-value]
+
+    def _materialise(self) -> list[BrowserUserAgentData]:
+        """Create the list returned by `to_list`, materialising all columns at once.
+
+        Returns:
+            list[BrowserUserAgentData]: All records, in order.
+        """
+        columns = [
+            (
+                self._columns[field]
+                if field in FLOAT_FIELDS
+                else self.values(field, range(self._count))
+            )
+            for field in FIELDS
+        ]
+        return [dict(zip(FIELDS, values)) for values in zip(*columns)]  # type: ignore[misc]
+
+    def values(self, field: str, indices: Iterable[int]) -> list[Any]:
+        """Get a single field of the given records.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+            indices (Iterable[int]): The indices of the records.
+
+        Returns:
+            list[Any]: The field values, in the order of `indices`.
+        """
+        column = self._columns[field]
+        if field in FLOAT_FIELDS:
+            return [column[idx] for idx in indices]
+        if field == "useragent":
+            return [self.useragent(idx) for idx in indices]
+        return [self._string(column[idx]) for idx in indices]
+
+    def distinct(self, field: str) -> set[Any]:
+        """Get the distinct values of a field over all records.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+
+        Returns:
+            set[Any]: The distinct values.
+        """
+        if field in FLOAT_FIELDS or field == "useragent":
+            return super().distinct(field)
+        return {self._string(code) for code in set(self._columns[field])}
+
+    def _codes(self, field: str, wanted: Collection[str]) -> set[int]:
+        """Get the string codes of a field that stand for one of the wanted values.
+
+        Args:
+            field (str): The name of a string field.
+            wanted (Collection[str]): The wanted values.
+
+        Returns:
+            set[int]: The matching codes.
+        """
+        return {
+            code for code in set(self._columns[field]) if self._string(code) in wanted
+        }
+
+    def select(
+        self,
+        browsers: Collection[str],
+        os: Collection[str],
+        types: Collection[str],
+        min_version: float,
+        min_percentage: float,
+    ) -> list[int]:
+        """Find the records matching all the given filters, comparing string codes.
+
+        Args:
+            browsers (Collection[str]): Allowed browser names.
+            os (Collection[str]): Allowed operating system names.
+            types (Collection[str]): Allowed device types (eg. desktop).
+            min_version (float): Minimum major and minor browser version.
+            min_percentage (float): Minimum usage percentage.
+
+        Returns:
+            list[int]: The indices of the matching records, in ascending order.
+        """
+        browser_codes = self._codes("browser", browsers)
+        os_codes = self._codes("os", os)
+        type_codes = self._codes("type", types)
+        columns = self._columns
+        return [
+            idx
+            for idx, (browser, os_, type_, version, percent) in enumerate(
+                zip(
+                    columns["browser"],
+                    columns["os"],
+                    columns["type"],
+                    columns["browser_version_major_minor"],
+                    columns["percent"],
+                )
+            )
+            if browser in browser_codes
+            and os_ in os_codes
+            and type_ in type_codes
+            and version >= min_version
+            and percent >= min_percentage
+        ]
+
+
+class ColumnarDataset(_PackedDataset):
+    """In-memory columnar dataset.
+
+    Numbers and string codes are kept in compact arrays, and the string table is decoded once,
+    so every distinct string (eg. "Chrome Mobile") exists only once in memory. Record
+    dictionaries are only created when a record is requested.
+
+    Args:
+        data (PackedData): The columns, as returned by `fake_useragent.packed.unpack`.
+    """
+
+    def __init__(self, data: PackedData):
+        strings: list[Optional[str]] = data.strings()  # type: ignore[assignment]
+        # Store None at the end of the string table, so all codes are list indices.
+        null_code = len(strings)
+        strings.append(None)
+
+        columns = dict(data.columns)
+        for field in STRING_FIELDS:
+            columns[field] = array(
+                UINT32_TYPECODE,
+                [null_code if code == NULL else code for code in columns[field]],
+            )
+        super().__init__(data.count, columns)
+        self._strings = strings
+
+    @classmethod
+    def from_records(cls, records: Iterable[BrowserUserAgentData]) -> "ColumnarDataset":
+        """Create a columnar dataset from record dictionaries.
+
+        Args:
+            records (Iterable[BrowserUserAgentData]): The records, following the
+                `BrowserUserAgentData` schema.
+
+        Returns:
+            ColumnarDataset: The dataset holding the records.
+        """
+        return cls(unpack(pack(records)))
+
+    def _string(self, code: int) -> Optional[str]:
+        """Get a string of the string table.
+
+        Args:
+            code (int): The string code.
+
+        Returns:
+            Optional[str]: The string, or None for the `NULL` code.
+        """
+        return self._strings[code]
+
+
+class BufferDataset(_PackedDataset):
+    """Dataset backed by a packed file in memory (see `fake_useragent.packed`), used in place.
+
+    The columns and the string table stay in the immutable buffer, so no Python object exists
+    per record or per user agent string. Reading the data never writes to the buffer's memory,
+    not even to update reference counts, which keeps it shared between a parent process and its
+    forked children (see `fake_useragent.utils.preload_shared_data`). Strings are only decoded
+    when they are needed: user agent strings each time they are requested, other strings once
+    per distinct value.
+
+    Args:
+        buffer (Union[bytes, mmap.mmap]): The packed file contents, eg. from
+            `fake_useragent.packed.pack`. It must not be modified while the dataset is in use.
+
+    Raises:
+        FakeUserAgentError: If the buffer is not a valid packed file.
+    """
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap]):
+        self._buffer = buffer
+        self._data = unpack(buffer, copy=False)
+        super().__init__(self._data.count, self._data.columns)
+        self._strings: dict[int, Optional[str]] = {NULL: None}
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the dataset as its buffer, since the column views can't be pickled.
+
+        Returns:
+            tuple[Any, ...]: The callable and arguments that recreate the dataset.
+        """
+        return (BufferDataset, (bytes(self._buffer),))
+
+    @classmethod
+    def from_records(cls, records: Iterable[BrowserUserAgentData]) -> "BufferDataset":
+        """Create a buffer dataset from record dictionaries.
+
+        Args:
+            records (Iterable[BrowserUserAgentData]): The records, following the
+                `BrowserUserAgentData` schema.
+
+        Returns:
+            BufferDataset: The dataset holding the records.
+        """
+        return BufferDataset(pack(records))
+
+    def _string(self, code: int) -> Optional[str]:
+        """Decode a string of the string table, caching the result.
+
+        Args:
+            code (int): The string code.
+
+        Returns:
+            Optional[str]: The decoded string, or None for the `NULL` code.
+        """
+        try:
+            return self._strings[code]
+        except KeyError:
+            string = self._strings[code] = self._data.string(code)
+            return string
+
+    def useragent(self, idx: int) -> str:
+        """Get the user agent string of a single record, decoding only that string.
+
+        Args:
+            idx (int): The index of the record.
+
+        Returns:
+            str: The user agent string.
+        """
+        return self._data.string(self._columns["useragent"][idx])  # type: ignore[return-value]
+
+    def _materialise(self) -> list[BrowserUserAgentData]:
+        """Create the list returned by `to_list`, decoding all columns at once.
+
+        Returns:
+            list[BrowserUserAgentData]: All records, in order.
+        """
+        return self._data.records()
+
+
+class MappedDataset(BufferDataset):
+    """Dataset backed by a memory-mapped packed file (see `fake_useragent.packed`).
+
+    The file is mapped read-only and its columns are used in place, so nothing is parsed up
+    front and processes mapping the same file share its memory through the OS page cache.
+    Strings are decoded like in `BufferDataset`.
+
+    Args:
+        path (Optional[Union[str, Path]], optional): The packed file to map. If None, the packed
+            file included in the package is used, which must be up-to-date with the included
+            `browsers.jsonl` file. Defaults to None.
+
+    Raises:
+        FakeUserAgentError: If the file can not be mapped, is not a valid packed file, or is the
+            outdated included packed file.
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        self._included = path is None
+        self.path = find_browser_packed_path() if path is None else Path(path)
+        try:
+            with open(self.path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as exc:
+            raise FakeUserAgentError(f"Unable to map {self.path}") from exc
+        super().__init__(self._mmap)
+        if path is None and not _packed_up_to_date(
+            self._data, find_browser_json_path()
+        ):
+            # Don't serve stale data, see `fake_useragent.utils._load_packed`.
+            raise FakeUserAgentError(f"{self.path} is outdated")
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle the dataset as its path, so it is mapped again when unpickled.
+
+        Returns:
+            tuple[Any, ...]: The callable and arguments that recreate the dataset.
+        """
+        return (MappedDataset, (None if self._included else self.path,))
+
+
+def load_dataset() -> ColumnarDataset:
+    """Load the included data into a columnar dataset.
+
+    The packed `browsers.bin` file is used when it is present and up-to-date, otherwise the
+    `browsers.jsonl` file is parsed.
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data.
+
+    Returns:
+        ColumnarDataset: The included data.
+    """
+    packed_data = _load_packed(find_browser_json_path())
+    if packed_data is None:
+        return ColumnarDataset.from_records(load())
+    return ColumnarDataset(packed_data)
+
+
+DataSource = Union[
+    str, "os.PathLike[str]", BinaryIO, Iterable[BrowserUserAgentData], Dataset
+]
+"""The sources `load_data_source` accepts."""
+
+
+def _parse_data_file(content: bytes) -> ColumnarDataset:
+    """Parse the contents of a packed or JSONL data file.
+
+    Args:
+        content (bytes): The file contents. Packed files are detected by their magic bytes,
+            anything else is parsed as JSONL.
+
+    Raises:
+        FakeUserAgentError: If unable to parse the data or it is empty.
+
+    Returns:
+        ColumnarDataset: The parsed data.
+    """
+    if content.startswith(MAGIC):
+        dataset = ColumnarDataset(unpack(content))
+    else:
+        try:
+            records = [
+                json.loads(line) for line in content.splitlines() if line.strip()
+            ]
+        except ValueError as exc:
+            raise FakeUserAgentError("Failed to parse the data file") from exc
+        dataset = ColumnarDataset.from_records(records)
+
+    if not len(dataset):
+        raise FakeUserAgentError("Data list is empty")
+    return dataset
+
+
+def load_data_source(source: DataSource) -> Dataset:
+    """Load user agent data from a custom source.
+
+    Args:
+        source (DataSource): One of:
+
+            - A path to a packed (`browsers.bin`) or JSONL (`browsers.jsonl`) data file.
+            - A binary file object holding such a file, which is read right away.
+            - An iterable of records following the `BrowserUserAgentData` schema, which is
+              validated and converted to a `ColumnarDataset` right away.
+            - A `Dataset`, which is used as is.
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data, it is empty or a record
+            doesn't follow the `BrowserUserAgentData` schema.
+        TypeError: If the source is of an unsupported type.
+
+    Returns:
+        Dataset: The loaded data.
+    """
+    if isinstance(source, Dataset):
+        return source
+    if isinstance(source, (str, os.PathLike)):
+        try:
+            content = Path(source).read_bytes()
+        except OSError as exc:
+            raise FakeUserAgentError(f"Unable to read {source}") from exc
+        return _parse_data_file(content)
+    if hasattr(source, "read"):
+        content = source.read()
+        if not isinstance(content, bytes):
+            msg = f"data_source file must be opened in binary mode but read {type(content).__name__}."
+            raise TypeError(msg)
+        return _parse_data_file(content)
+    if isinstance(source, Iterable) and not isinstance(source, (bytes, bytearray)):
+        dataset = ColumnarDataset.from_records(source)
+        if not len(dataset):
+            raise FakeUserAgentError("Data list is empty")
+        return dataset
+
+    msg = f"data_source must be a path, binary file, iterable of records or Dataset but got {type(source).__name__}."
+    raise TypeError(msg)
@@ -0,0 +1,157 @@
+"""Delta updates for the browser user agent data.
+
+A delta describes how to get from one version of the data to another, so fresher data can be
+applied on top of the included data file without shipping the whole file. It is stored as a
+JSONlines file, with one operation per line:
+
+- `{"op": "add", "record": {...}}` adds a record, or replaces the records with the same user
+  agent string.
+- `{"op": "remove", "useragent": "..."}` removes the records with the given user agent string.
+- `{"op": "reweight", "useragent": "...", "percent": 0.1}` changes the usage percentage of the
+  records with the given user agent string.
+
+Records are identified by their user agent string. The data may list a user agent string more
+than once, an operation applies to all of its records. Operations for user agent strings that are not
+in the data are ignored, so a delta can safely be applied to slightly different data.
+"""
+
+import json
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from fake_useragent.errors import FakeUserAgentError
+from fake_useragent.utils import BrowserUserAgentData
+
+DELTA_ENV_VAR = "FAKE_USERAGENT_DELTA"
+"""Environment variable with the path of a delta file to apply when loading the included data."""
+
+DeltaOperation = dict[str, Any]
+"""A single delta operation, see the module documentation."""
+
+
+def make_delta(
+    old: Iterable[BrowserUserAgentData], new: Iterable[BrowserUserAgentData]
+) -> list[DeltaOperation]:
+    """Compute the delta between two versions of the data.
+
+    Args:
+        old (Iterable[BrowserUserAgentData]): The previous records.
+        new (Iterable[BrowserUserAgentData]): The updated records.
+
+    Returns:
+        list[DeltaOperation]: The operations that turn `old` into `new`: "add" and "reweight"
+            operations in the order of `new`, followed by "remove" operations in the order of
+            `old`.
+    """
+    previous = {record["useragent"]: record for record in old}
+    operations: list[DeltaOperation] = []
+    seen = set()
+    for record in new:
+        useragent = record["useragent"]
+        seen.add(useragent)
+        old_record = previous.get(useragent)
+        if old_record == record:
+            continue
+        if (
+            old_record is not None
+            and {**old_record, "percent": record["percent"]} == record
+        ):
+            operations.append(
+                {"op": "reweight", "useragent": useragent, "percent": record["percent"]}
+            )
+        else:
+            operations.append({"op": "add", "record": record})
+
+    operations.extend(
+        {"op": "remove", "useragent": useragent}
+        for useragent in previous
+        if useragent not in seen
+    )
+    return operations
+
+
+def apply_delta(
+    records: Iterable[BrowserUserAgentData], operations: Iterable[DeltaOperation]
+) -> list[BrowserUserAgentData]:
+    """Apply a delta to records.
+
+    Args:
+        records (Iterable[BrowserUserAgentData]): The records to update, they are not modified.
+        operations (Iterable[DeltaOperation]): The delta operations, eg. from `read_delta()`.
+
+    Raises:
+        FakeUserAgentError: If an operation is invalid.
+
+    Returns:
+        list[BrowserUserAgentData]: The updated records. Records keep their position, added
+            records come last.
+    """
+    updated: list[Optional[BrowserUserAgentData]] = list(records)
+    # The data may list a user agent string more than once, operations apply to all of them.
+    positions: dict[str, list[int]] = {}
+    for position, record in enumerate(updated):
+        positions.setdefault(record["useragent"], []).append(position)  # type: ignore[index]
+    for operation in operations:
+        try:
+            op = operation["op"]
+            if op == "add":
+                record = operation["record"]
+                useragent = record["useragent"]
+                found = positions.get(useragent)
+                if found:
+                    updated[found[0]] = record
+                    for position in found[1:]:
+                        updated[position] = None
+                    positions[useragent] = found[:1]
+                else:
+                    positions[useragent] = [len(updated)]
+                    updated.append(record)
+            elif op == "remove":
+                for position in positions.pop(operation["useragent"], ()):
+                    updated[position] = None
+            elif op == "reweight":
+                for position in positions.get(operation["useragent"], ()):
+                    updated[position] = {
+                        **updated[position],  # type: ignore[dict-item]
+                        "percent": float(operation["percent"]),
+                    }
+            else:
+                raise FakeUserAgentError(f"Unknown delta operation {op!r}")
+        except (KeyError, TypeError, ValueError) as exc:
+            raise FakeUserAgentError(f"Invalid delta operation {operation!r}") from exc
+    return [record for record in updated if record is not None]
+
+
+def read_delta(path: Union[str, Path]) -> list[DeltaOperation]:
+    """Read the operations of a delta file.
+
+    Args:
+        path (Union[str, Path]): The delta file.
+
+    Raises:
+        FakeUserAgentError: If unable to read or parse the file.
+
+    Returns:
+        list[DeltaOperation]: The delta operations.
+    """
+    try:
+        return [
+            json.loads(line)
+            for line in Path(path).read_text().splitlines()
+            if line.strip()
+        ]
+    except (OSError, ValueError) as exc:
+        raise FakeUserAgentError(f"Failed to load or parse delta file {path}") from exc
+
+
+def write_delta(operations: Iterable[DeltaOperation], path: Union[str, Path]) -> None:
+    """Write delta operations to a file.
+
+    Args:
+        operations (Iterable[DeltaOperation]): The delta operations, eg. from `make_delta()`.
+        path (Union[str, Path]): The delta file to write.
+    """
+    with open(path, "w") as f:
+        for operation in operations:
+            f.write(json.dumps(operation) + "\n")
@@ -1,11 +1,87 @@
 """Fake User Agent retriever."""
 
+import itertools
+import operator
+import os
 import random
-from collections.abc import Iterable
-from typing import Any, Optional, Union
-
+import threading
+import weakref
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Hashable, Iterable, Iterator
+from os import PathLike
+from pathlib import Path
+from time import perf_counter
+from typing import Any, NamedTuple, Optional, Union
+
+from fake_useragent.dataset import (
+    ColumnarDataset,
+    Dataset,
+    DataSource,
+    RecordDataset,
+    load_data_source,
+)
+from fake_useragent.errors import FakeUserAgentError
+from fake_useragent.headers import DEFAULT_ACCEPT_LANGUAGE, build_headers
 from fake_useragent.log import logger
-from fake_useragent.utils import BrowserUserAgentData, load
+from fake_useragent.packed import UINT32_TYPECODE, unpack, write_packed
+from fake_useragent.query import (
+    QUERY_FIELDS,
+    BitmapIndex,
+    UserAgentQuery,
+    version_tuple,
+)
+from fake_useragent.sampling import (
+    AliasTable,
+    jump_hash,
+    stable_hash,
+    systematic_sample,
+)
+from fake_useragent.stats import PickEvent, StatsCollector, UserAgentStats
+from fake_useragent.utils import BrowserUserAgentData, get_shared_data
+
+SNAPSHOT_VERSION = 1
+"""Version of the snapshots written by `FakeUserAgent.save_snapshot`."""
+BROWSER_ALIASES: dict[str, Optional[tuple[str, ...]]] = {
+    "random": None,
+    "chrome": ("Chrome", "Chrome Mobile", "Chrome Mobile iOS"),
+    "googlechrome": ("Chrome", "Chrome Mobile", "Chrome Mobile iOS"),
+    "firefox": ("Firefox", "Firefox Mobile", "Firefox iOS"),
+    "ff": ("Firefox", "Firefox Mobile", "Firefox iOS"),
+    "safari": ("Safari", "Mobile Safari"),
+    "opera": ("Opera", "Opera Mobile"),
+    "google": ("Google",),
+    "edge": ("Edge", "Edge Mobile"),
+}
+"""Lowercase attribute names that select a group of browsers (None selects all browsers)."""
+# All live instances, so their random generators can be reseeded in forked child processes.
+_instances: "weakref.WeakSet[FakeUserAgent]" = weakref.WeakSet()
+
+
+def _reseed_instances_in_child() -> None:
+    """Reseed the random generators of all instances in a forked child process."""
+    for instance in list(_instances):
+        instance._after_fork_in_child()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_instances_in_child)
+
+
+def _stats_key(browsers: Union[str, list[str]]) -> str:
+    """Get the key of requested browser(s) in the statistics.
+
+    Args:
+        browsers (Union[str, list[str]]): The requested browser name(s).
+
+    Returns:
+        str: "random" for all browsers, otherwise the comma separated browser names.
+    """
+    if not browsers or browsers == "random":
+        return "random"
+    if isinstance(browsers, str):
+        return browsers
+    return ",".join(browsers)
 
 
 def _ensure_iterable(
@@ -65,6 +141,20 @@ def _ensure_float(value: Any) -> float:
         raise ValueError(msg) from ve
 
 
+def _query_values(values: Union[str, Iterable[str]]) -> frozenset[str]:
+    """Convert the value(s) of a query criterion to a frozen set.
+
+    Args:
+        values (Union[str, Iterable[str]]): A single value or an iterable of values.
+
+    Returns:
+        frozenset[str]: The values.
+    """
+    if isinstance(values, str):
+        return frozenset((values,))
+    return frozenset(values)
+
+
 def _is_magic_name(attribute_name: str) -> bool:
     """Judge whether the given attribute name is the name of a magic method(e.g. __iter__).
 
@@ -83,9 +173,45 @@ def _is_magic_name(attribute_name: str) -> bool:
     )
 
 
+class PoolCacheInfo(NamedTuple):
+    """Statistics about the cache of user agent pools of a `FakeUserAgent`."""
+
+    hits: int
+    """Number of requests served from the cache."""
+    misses: int
+    """Number of requests that had to build a pool."""
+    maxsize: int
+    """Maximum number of cached pools."""
+    currsize: int
+    """Current number of cached pools."""
+
+
+class _Pool:
+    """The user agents of one browser selection, with lazily built sampling tables.
+
+    The indices are kept in an array rather than a list of `int` objects, so picking from a
+    pool never updates reference counts in it. That keeps pools built in a parent process
+    shared with its forked children (see `fake_useragent.utils.preload_shared_data`).
+
+    Args:
+        indices (Iterable[int]): Dataset indices of the user agents, in ascending order.
+    """
+
+    __slots__ = ("alias_table", "indices")
+
+    def __init__(self, indices: Iterable[int]):
+        self.indices = (
+            indices if isinstance(indices, array) else array(UINT32_TYPECODE, indices)
+        )
+        self.alias_table: Optional[AliasTable] = None
+
+
 class FakeUserAgent:
     """Fake User Agent retriever.
 
+    The user agent data is loaded on the first request for a user agent, see `warmup()`.
+    Invalid arguments are still reported right away.
+
     Args:
         browsers (Optional[Iterable[str]], optional): If given, will only ever return user agents
             from these browsers. If None, set to:
@@ -109,12 +235,44 @@ class FakeUserAgent:
             to facilitate retrieval of user agents by browser. If you need to prevent some
             attributes from being treated as browsers, pass them here. If None, all attributes will
             be treated as browsers. Defaults to ["shape"] to prevent unintended calls in IDEs like PyCharm.
+        weighted (bool, optional): If True, pick user agents proportionally to their usage
+            percentage, so the returned user agents follow the real world browser mix. If False,
+            every user agent is equally likely. Defaults to False.
+        seed (Optional[Union[int, float, str, bytes, bytearray]], optional): Seed for the random
+            generator of the instance, to get reproducible user agents. If None, the generator is
+            seeded from the operating system. Defaults to None.
+        thread_local (bool, optional): If True, every thread gets its own random generator, so
+            threads never share random state. With a `seed`, each thread's generator is seeded
+            with the `seed` and the order in which the threads first picked a user agent.
+            Defaults to False.
+        pool_cache_size (int, optional): Maximum number of browser selections (eg. the browsers
+            of `ua.chrome`, or `ua["Safari"]`) to keep filtered user agent pools cached for.
+            Defaults to 128.
+        data_source (Optional[DataSource], optional): Custom user agent data for this instance,
+            instead of the data shared by all instances: a path to a packed or JSONL data file
+            (loaded on the first request for a user agent), a binary file object, an iterable of
+            records following the `BrowserUserAgentData` schema or a
+            `fake_useragent.dataset.Dataset`. See `fake_useragent.dataset.load_data_source`.
+            If None, use the included data. Defaults to None.
+        collect_stats (bool, optional): If True, collect usage statistics, see `stats()`.
+            Defaults to False.
+        on_pick (Optional[Callable[[PickEvent], None]], optional): Called after every request
+            for user agents with a `fake_useragent.stats.PickEvent`, eg. to export metrics.
+            Implies `collect_stats`. Defaults to None.
+
+    Instances are safe to use from multiple threads: the data is loaded once under a lock, the
+    filter index is read-only afterwards and lazily built caches are only ever added to.
+    Instances never use the global `random` module state. In a child process forked from a
+    process using an instance, the instance's random generator is reseeded unless a `seed` was
+    given (see `fake_useragent.utils.preload_shared_data`).
 
     Raises:
-        TypeError: If `fallback` isn't a `str` or `safe_attrs` contains non-`str` values.
+        TypeError: If `fallback` isn't a `str`, `safe_attrs` contains non-`str` values or
+            `data_source` is of an unsupported type.
+        FakeUserAgentError: If unable to load a `data_source` file object or iterable.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         browsers: Optional[Iterable[str]] = None,
         os: Optional[Iterable[str]] = None,
@@ -127,6 +285,14 @@ class FakeUserAgent:
             "Chrome/122.0.0.0 Safari/537.36 Edg/122.0.0.0"
         ),
         safe_attrs: Optional[Iterable[str]] = None,
+        *,
+        weighted: bool = False,
+        seed: Optional[Union[int, float, str, bytes, bytearray]] = None,
+        thread_local: bool = False,
+        pool_cache_size: int = 128,
+        data_source: Optional[DataSource] = None,
+        collect_stats: bool = False,
+        on_pick: Optional[Callable[[PickEvent], None]] = None,
     ):
         self.browsers = _ensure_iterable(
             browsers=browsers,
@@ -193,8 +359,470 @@ class FakeUserAgent:
             raise TypeError(msg)
         self.safe_attrs = set(safe_attrs)
 
-        # Next, load our local data file into memory (browsers.jsonl)
-        self.data_browsers = load()
+        self.weighted = bool(weighted)
+
+        self.seed = seed
+        self._random = random.Random(seed)  # noqa: S311
+        # Thread-local random generators, if enabled, created on first use in each thread
+        self._thread_randoms = threading.local() if thread_local else None
+        self._thread_counter = itertools.count()
+
+        # The data file is only loaded and indexed on the first request for a user agent (or
+        # when calling warmup()), so creating an instance at import time stays cheap.
+        self._dataset: Optional[Dataset] = None
+        self._load_lock = threading.Lock()
+        # Whether the data is the process-wide shared data, which isn't pickled with instances.
+        self._uses_shared_data = False
+
+        # Paths are loaded lazily like the shared data. File objects and iterables may not be
+        # readable anymore by then, so load those right away.
+        if data_source is not None and not isinstance(data_source, (str, PathLike)):
+            data_source = load_data_source(data_source)
+        self._data_source = data_source
+
+        # LRU cache of user agent pools, keyed by the frozen set of requested browser names
+        # (None for all browsers), by ("attr", name) for attribute lookups (see
+        # `__getattr__`) or by the criteria of a query (see `query()`).
+        self._pool_cache_size = operator.index(pool_cache_size)
+        if self._pool_cache_size < 0:
+            msg = f"pool_cache_size must not be negative but got {pool_cache_size}."
+            raise ValueError(msg)
+        self._pool_cache: OrderedDict[Hashable, _Pool] = OrderedDict()
+        self._pool_cache_hits = 0
+        self._pool_cache_misses = 0
+
+        # Bitsets answering queries (see `query()`), built on the first query.
+        self._bitmap_index: Optional[BitmapIndex] = None
+
+        # Headers derived from each user agent (see `headers()`), keyed by dataset index.
+        self._headers_cache: dict[int, dict[str, str]] = {}
+
+        # Statistics are opt-in, hot paths only check for None when they are disabled. Set
+        # last, since `__getattr__` uses it to tell whether the instance is initialised.
+        self._stats: Optional[StatsCollector] = None
+        if collect_stats or on_pick is not None:
+            self._stats = StatsCollector(on_pick)
+
+        _instances.add(self)
+
+    def warmup(self) -> None:
+        """Load the user agent data and build the filter index now.
+
+        This normally happens on the first request for a user agent. Call this method to pay
+        that cost up front instead, for example when starting a server. Calling it again does
+        nothing.
+
+        Raises:
+            FakeUserAgentError: If unable to load or parse the data.
+        """
+        if self._dataset is None:
+            with self._load_lock:
+                if self._dataset is None:
+                    if self._data_source is not None:
+                        data = load_data_source(self._data_source)
+                    else:
+                        # Get our local data file (browsers.jsonl), which is loaded into
+                        # memory once and shared by all instances
+                        data = get_shared_data()
+                        self._uses_shared_data = True
+                    self._build_index(
+                        data if isinstance(data, Dataset) else RecordDataset(data)
+                    )
+
+    @property
+    def data_browsers(self) -> list[BrowserUserAgentData]:
+        """All loaded user agents as dictionaries, regardless of the instance filters.
+
+        The dictionaries are created on first access and shared with other instances using the
+        same data, so they must be treated as read-only.
+        """
+        self.warmup()
+        return self._dataset.to_list()  # type: ignore[union-attr]
+
+    @data_browsers.setter
+    def data_browsers(self, records: Iterable[BrowserUserAgentData]) -> None:
+        """Replace the user agents of this instance only, and filter them again.
+
+        Other instances keep their data. The instance must not be in use by other threads
+        while the data is replaced.
+
+        Args:
+            records (Iterable[BrowserUserAgentData]): The new user agents.
+        """
+        with self._load_lock:
+            self._pool_cache.clear()
+            self._headers_cache.clear()
+            self._bitmap_index = None
+            self._uses_shared_data = False
+            self._build_index(RecordDataset(list(records)))
+
+    def save_snapshot(self, path: Union[str, PathLike]) -> None:
+        """Save the user agents matching the instance filters, and the filters, to a file.
+
+        Use `from_snapshot()` to create an instance from the file, without loading the full data
+        and filtering it again.
+
+        Args:
+            path (Union[str, PathLike]): The snapshot file to write, in the packed format (see
+                `fake_useragent.packed`).
+
+        Raises:
+            FakeUserAgentError: If unable to load the data.
+        """
+        self.warmup()
+        records = (self._dataset[idx] for idx in self._indices)  # type: ignore[index]
+        write_packed(
+            records,
+            path,
+            metadata={
+                "snapshot": {
+                    "version": SNAPSHOT_VERSION,
+                    "filters": {
+                        "browsers": self.browsers,
+                        "os": self.os,
+                        "min_version": self.min_version,
+                        "min_percentage": self.min_percentage,
+                        "platforms": self.platforms,
+                    },
+                }
+            },
+        )
+
+    @classmethod
+    def from_snapshot(
+        cls, path: Union[str, PathLike], **kwargs: Any
+    ) -> "FakeUserAgent":
+        """Create an instance from a snapshot written by `save_snapshot()`.
+
+        The instance uses the filters and user agents stored in the snapshot, and is ready to
+        use right away.
+
+        Args:
+            path (Union[str, PathLike]): The snapshot file.
+            **kwargs (Any): Other keyword arguments for the instance, eg. `fallback` or `seed`.
+                The filter arguments are taken from the snapshot.
+
+        Raises:
+            FakeUserAgentError: If unable to read the file or it is not a snapshot.
+
+        Returns:
+            FakeUserAgent: The instance.
+        """
+        try:
+            data = unpack(Path(path).read_bytes())
+        except OSError as exc:
+            raise FakeUserAgentError(f"Unable to read snapshot {path}") from exc
+        snapshot = data.metadata.get("snapshot")
+        if not isinstance(snapshot, dict) or "filters" not in snapshot:
+            raise FakeUserAgentError(f"{path} is not a snapshot")
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            raise FakeUserAgentError(
+                f"Unsupported snapshot version {snapshot.get('version')}"
+            )
+
+        ua = cls(**snapshot["filters"], **kwargs)
+        dataset = ColumnarDataset(data)
+        # The snapshot only holds user agents matching the filters.
+        ua._build_index(dataset, list(range(len(dataset))))
+        return ua
+
+    def _build_index(
+        self, dataset: Dataset, indices: Optional[list[int]] = None
+    ) -> None:
+        """Filter the user agents on the instance filters and index them by browser name.
+
+        Sets `self._indices` to an array of the dataset indices of the user agents matching all
+        instance filters, and `self._browser_index` to a mapping of browser name to an array of
+        the matching indices.
+        Sets `self._dataset` last, since it marks the instance as loaded.
+
+        Args:
+            dataset (Dataset): The user agent data to use.
+            indices (Optional[list[int]], optional): The indices of the user agents matching
+                the instance filters, if already known. If None, filter the dataset.
+                Defaults to None.
+        """
+        start = perf_counter()
+        if indices is None:
+            # The instance filters never change after construction, so the eligible user
+            # agents are filtered once here and indexed by browser name for O(1) lookups later
+            # on. Filter based on browser, os, type, browser version and percentage (weight).
+            # We check platform on type here (I know it's confusing).
+            indices = dataset.select(
+                browsers=set(self.browsers),
+                os=set(self.os),
+                types=set(self.platforms),
+                min_version=self.min_version,
+                min_percentage=self.min_percentage,
+            )
+        # Arrays instead of lists of `int` objects, see `_Pool`.
+        self._indices = array(UINT32_TYPECODE, indices)
+
+        browser_index: dict[str, array] = {}
+        for idx, browser in zip(
+            self._indices, dataset.values("browser", self._indices)
+        ):
+            browser_index.setdefault(browser, array(UINT32_TYPECODE)).append(idx)
+        self._browser_index = browser_index
+        if self._stats is not None:
+            self._stats.record_filter("random", len(indices), perf_counter() - start)
+
+        self._dataset = dataset
+
+    def _get_random(self) -> random.Random:
+        """Get the random generator to use in the current thread.
+
+        Returns:
+            random.Random: The instance's random generator, or the generator of the current
+                thread if the instance is `thread_local`.
+        """
+        thread_randoms = self._thread_randoms
+        if thread_randoms is None:
+            return self._random
+        try:
+            return thread_randoms.random
+        except AttributeError:
+            thread_seed = None
+            if self.seed is not None:
+                thread_seed = f"{self.seed!r}:{next(self._thread_counter)}"
+            thread_randoms.random = random.Random(thread_seed)  # noqa: S311
+            return thread_randoms.random
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle or copy the instance with.
+
+        Locks, thread-local random generators and lazily built caches are left out and created
+        again when the instance is restored. So is the process-wide shared data, which the
+        restored instance loads again on its first request for a user agent.
+
+        Returns:
+            dict[str, Any]: The state.
+        """
+        state = self.__dict__.copy()
+        for name in (
+            "_load_lock",
+            "_thread_counter",
+            "_pool_cache",
+            "_headers_cache",
+            "_bitmap_index",
+        ):
+            del state[name]
+        state["_thread_randoms"] = self._thread_randoms is not None
+        state["_pool_cache_hits"] = state["_pool_cache_misses"] = 0
+        if self._uses_shared_data:
+            for name in ("_indices", "_browser_index"):
+                state.pop(name, None)
+            state["_dataset"] = None
+            state["_uses_shared_data"] = False
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the instance from the state returned by `__getstate__()`.
+
+        Args:
+            state (dict[str, Any]): The state.
+        """
+        state = dict(state)
+        thread_local = state.pop("_thread_randoms")
+        self.__dict__.update(state)
+        self._thread_randoms = threading.local() if thread_local else None
+        self._thread_counter = itertools.count()
+        self._load_lock = threading.Lock()
+        self._pool_cache = OrderedDict()
+        self._headers_cache = {}
+        self._bitmap_index = None
+        _instances.add(self)
+
+    def _after_fork_in_child(self) -> None:
+        """Prepare the instance for use in a forked child process.
+
+        Unseeded random generators are reseeded from the operating system, since the child
+        would otherwise repeat the picks of the parent and its other children. Seeded
+        generators are kept, so seeded instances stay reproducible. Locks are replaced, in case
+        another thread of the parent held them while forking.
+        """
+        if self.seed is None:
+            self._random = random.Random()  # noqa: S311
+            if self._thread_randoms is not None:
+                self._thread_randoms = threading.local()
+        self._load_lock = threading.Lock()
+        if self._stats is not None:
+            self._stats.after_fork_in_child()
+
+    def _pool(self, browsers: Union[str, list[str]]) -> _Pool:
+        """Get the pool of user agents for the given browser name(s).
+
+        Pools are kept in a bounded LRU cache keyed by the set of requested browser names, so
+        repeated requests for the same browsers reuse the same pool.
+
+        Args:
+            browsers (Union[str, list[str]]): The browser name(s) to look up. Falsy values and
+                the special keyword "random" select all user agents allowed by the instance.
+
+        Returns:
+            _Pool: The pool, which is empty if no allowed user agent matches.
+        """
+        if self._dataset is None:
+            self.warmup()
+
+        if not browsers or browsers == "random":
+            key = None
+        elif isinstance(browsers, str):
+            key = frozenset((browsers,))
+        else:
+            key = frozenset(browsers)
+        return self._cached_pool(
+            key, lambda: self._make_pool(key), lambda: _stats_key(browsers)
+        )
+
+    def _cached_pool(
+        self,
+        key: Hashable,
+        make: Callable[[], _Pool],
+        stats_key: Callable[[], str],
+    ) -> _Pool:
+        """Get a pool from the LRU cache of pools, creating it on a miss.
+
+        Args:
+            key (Hashable): The cache key.
+            make (Callable[[], _Pool]): Creates the pool.
+            stats_key (Callable[[], str]): Returns the key to record the pool under in the
+                statistics.
+
+        Returns:
+            _Pool: The pool.
+        """
+        cache = self._pool_cache
+        pool = cache.get(key)
+        if pool is not None:
+            self._pool_cache_hits += 1
+            try:
+                cache.move_to_end(key)
+            except KeyError:  # Evicted by another thread in the meantime.
+                pass
+            return pool
+
+        self._pool_cache_misses += 1
+        if self._stats is None:
+            pool = make()
+        else:
+            start = perf_counter()
+            pool = make()
+            self._stats.record_filter(
+                stats_key(), len(pool.indices), perf_counter() - start
+            )
+
+        if self._pool_cache_size:
+            cache[key] = pool
+            while len(cache) > self._pool_cache_size:
+                try:
+                    cache.popitem(last=False)
+                except KeyError:  # Emptied by another thread in the meantime.
+                    break
+        return pool
+
+    def _make_pool(self, browsers: Optional[Collection[str]]) -> _Pool:
+        """Create the pool of user agents for the given browser names.
+
+        Args:
+            browsers (Optional[Collection[str]]): The browser names, or None for all user agents
+                allowed by the instance.
+
+        Returns:
+            _Pool: The pool, which is empty if no allowed user agent matches.
+        """
+        if browsers is None:
+            return _Pool(self._indices)
+        lists = [
+            self._browser_index[name]
+            for name in browsers
+            if name in self._browser_index
+        ]
+        if len(lists) == 1:
+            return _Pool(lists[0])
+        # Keep the original data file order of the filtered user agents.
+        return _Pool(sorted(idx for idx_list in lists for idx in idx_list))
+
+    def _attr_pool(self, attr: str) -> _Pool:
+        """Get the pool of user agents an attribute name selects.
+
+        Names are resolved as an exact browser name of the data (eg. "Chrome Mobile") first,
+        then as one of the aliases in `BROWSER_ALIASES` (eg. "ff") and finally as a
+        case-insensitive browser name (eg. "chrome mobile"). The resolved pools are kept in the
+        LRU cache of pools.
+
+        Args:
+            attr (str): The attribute name.
+
+        Returns:
+            _Pool: The pool, which is empty if no allowed user agent matches. In that case a
+                warning is logged when the pool is created.
+        """
+        if self._dataset is None:
+            self.warmup()
+        return self._cached_pool(
+            ("attr", attr), lambda: self._resolve_attr(attr), lambda: attr
+        )
+
+    def _resolve_attr(self, attr: str) -> _Pool:
+        """Create the pool of user agents an attribute name selects, see `_attr_pool()`.
+
+        Args:
+            attr (str): The attribute name.
+
+        Returns:
+            _Pool: The pool, which is empty if no allowed user agent matches.
+        """
+        lowered = attr.lower()
+        # Browsers excluded by the instance filters are still exact names, and get the fallback.
+        if attr in self._browser_index or attr in self._dataset.distinct("browser"):  # type: ignore[union-attr]
+            names: Optional[Collection[str]] = (attr,)
+        elif lowered in BROWSER_ALIASES:
+            names = BROWSER_ALIASES[lowered]
+        else:
+            names = [name for name in self._browser_index if name.lower() == lowered]
+
+        pool = self._make_pool(names)
+        if not pool.indices:
+            logger.warning(
+                f"Error occurred during getting browser(s): {attr}, "
+                "but was suppressed with fallback.",
+            )
+        return pool
+
+    def pool_cache_info(self) -> PoolCacheInfo:
+        """Get statistics about the cache of user agent pools.
+
+        Under concurrent use from multiple threads, the hit and miss counts are approximate.
+
+        Returns:
+            PoolCacheInfo: The cache hits, misses, maximum size and current size.
+        """
+        return PoolCacheInfo(
+            self._pool_cache_hits,
+            self._pool_cache_misses,
+            self._pool_cache_size,
+            len(self._pool_cache),
+        )
+
+    def _alias_table(self, pool: _Pool) -> AliasTable:
+        """Get the alias table for weighted picks from a pool, building it on first use.
+
+        Args:
+            pool (_Pool): A non-empty pool.
+
+        Returns:
+            AliasTable: The alias table over the usage percentages of the pool's user agents.
+        """
+        table = pool.alias_table
+        if table is None:
+            try:
+                table = AliasTable(self._dataset.values("percent", pool.indices))  # type: ignore[union-attr]
+            except ValueError:
+                # Without any usage statistics, every user agent is equally likely.
+                table = AliasTable([1.0] * len(pool.indices))
+            pool.alias_table = table
+        return table
 
     def getBrowser(self, browsers: Union[str, list[str]]) -> BrowserUserAgentData:
         """Get a browser user agent based on the filters.
@@ -205,41 +833,500 @@ class FakeUserAgent:
         Returns:
             BrowserUserAgentData: The user agent with additional data.
         """
+        stats = self._stats
+        fallback = False
+        # Loading the data happens outside of the try block, so its errors aren't suppressed.
+        pool = self._pool(browsers)
+        # Building the pool is counted in the filter time, not in the sample time.
+        start = perf_counter() if stats is not None else 0.0
         try:
-            if browsers == "random":
-                # Filter the browser list based on the browsers array using lambda
-                # And based on OS list
-                # And percentage is bigger then min percentage
-                # And convert the iterator back to a list
-                filtered_browsers = self._filter_useragents()
-            else:
-                # Or when random isn't select, we filter the browsers array based on the 'request' using lamba
-                # And based on OS list
-                # And percentage is bigger then min percentage
-                # And convert the iterator back to a list
-                filtered_browsers = self._filter_useragents(browsers_to_filter=browsers)
-
-            # Pick a random browser user-agent from the filtered browsers
+            # Pick a random browser user-agent from the pre-filtered user agents
             # And return the full dict
-            return random.choice(filtered_browsers)  # noqa: S311
+            idx = self._pick(pool)
+            record = self._dataset[idx]  # type: ignore[index]
         except (KeyError, IndexError):
             logger.warning(
                 f"Error occurred during getting browser(s): {browsers}, "
                 "but was suppressed with fallback.",
             )
+            fallback = True
             # Return fallback object
-            return {
-                "useragent": self.fallback,
-                "percent": 100.0,
-                "type": "desktop",
-                "device_brand": None,
-                "browser": "Edge",
-                "browser_version": "122.0.0.0",
-                "browser_version_major_minor": 122.0,
-                "os": "win32",
-                "os_version": "10",
-                "platform": "Win32",
-            }
+            record = self._fallback_record()
+        if stats is not None:
+            stats.record_pick(_stats_key(browsers), 1, fallback, perf_counter() - start)
+        return record
+
+    def _fallback_record(self) -> BrowserUserAgentData:
+        """Get the fallback user agent, with additional data.
+
+        Returns:
+            BrowserUserAgentData: The fallback user agent.
+        """
+        return {
+            "useragent": self.fallback,
+            "percent": 100.0,
+            "type": "desktop",
+            "device_brand": None,
+            "browser": "Edge",
+            "browser_version": "122.0.0.0",
+            "browser_version_major_minor": 122.0,
+            "os": "win32",
+            "os_version": "10",
+            "platform": "Win32",
+        }
+
+    def headers(
+        self,
+        browsers: Union[str, list[str]] = "random",
+        accept_language: Optional[str] = DEFAULT_ACCEPT_LANGUAGE,
+    ) -> dict[str, str]:
+        """Get request headers for a random user agent, consistent with that user agent.
+
+        Besides the `User-Agent` header, this includes `Accept`, `Accept-Language` and, for
+        Chromium based browsers, the User-Agent Client Hints headers (`Sec-CH-UA`,
+        `Sec-CH-UA-Mobile` and `Sec-CH-UA-Platform`). See
+        `fake_useragent.headers.build_headers`. The headers of every user agent are derived
+        once and cached.
+
+        Args:
+            browsers (Union[str, list[str]], optional): The browser name(s) to get. Special
+                keyword "random" will return headers for any browser allowed by the instance.
+                Defaults to "random".
+            accept_language (Optional[str], optional): The `Accept-Language` header. If None,
+                the header is left out. Defaults to "en-US,en;q=0.9".
+
+        Returns:
+            dict[str, str]: The headers, a new dictionary on every call.
+        """
+        stats = self._stats
+        fallback = False
+        pool = self._pool(browsers)
+        start = perf_counter() if stats is not None else 0.0
+        try:
+            idx = self._pick(pool)
+        except (KeyError, IndexError):
+            logger.warning(
+                f"Error occurred during getting browser(s): {browsers}, "
+                "but was suppressed with fallback.",
+            )
+            fallback = True
+            idx = -1  # Cache key of the fallback user agent.
+
+        headers = self._headers_cache.get(idx)
+        if headers is None:
+            record = self._fallback_record() if fallback else self._dataset[idx]  # type: ignore[index]
+            headers = self._headers_cache[idx] = build_headers(record, None)
+        headers = dict(headers)
+        if accept_language is not None:
+            headers["Accept-Language"] = accept_language
+
+        if stats is not None:
+            stats.record_pick(_stats_key(browsers), 1, fallback, perf_counter() - start)
+        return headers
+
+    def _get_useragent(self, browsers: Union[str, list[str]]) -> str:
+        """Get a browser user agent string based on the filters, without the additional data.
+
+        Args:
+            browsers (Union[str, list[str]]): The browser name(s) to get. Special keyword "random"
+                will return a random user-agent string.
+
+        Returns:
+            str: The user agent string.
+        """
+        stats = self._stats
+        fallback = False
+        pool = self._pool(browsers)
+        start = perf_counter() if stats is not None else 0.0
+        try:
+            idx = self._pick(pool)
+            useragent = self._dataset.useragent(idx)  # type: ignore[union-attr]
+        except (KeyError, IndexError):
+            logger.warning(
+                f"Error occurred during getting browser(s): {browsers}, "
+                "but was suppressed with fallback.",
+            )
+            fallback = True
+            useragent = self.fallback
+        if stats is not None:
+            stats.record_pick(_stats_key(browsers), 1, fallback, perf_counter() - start)
+        return useragent
+
+    def sample(
+        self,
+        n: int,
+        browsers: Union[str, list[str]] = "random",
+        weighted: Optional[bool] = None,
+    ) -> list[str]:
+        """Get many user agent strings in one call.
+
+        This is much faster than getting the user agents one by one, since the browser lookup is
+        done once and the random picks happen in one batch.
+
+        Args:
+            n (int): The number of user agents to get.
+            browsers (Union[str, list[str]], optional): The browser name(s) to get. Special keyword
+                "random" will return user agents from any browser allowed by the instance.
+                Defaults to "random".
+            weighted (Optional[bool], optional): Whether to pick user agents proportionally to
+                their usage percentage. If None, use the `weighted` setting of the instance.
+                Defaults to None.
+
+        Raises:
+            ValueError: If `n` is negative.
+
+        Returns:
+            list[str]: The `n` user agent strings, picked with replacement.
+        """
+        stats = self._stats
+        pool = self._pool(browsers)
+        start = perf_counter() if stats is not None else 0.0
+        if not pool.indices:
+            logger.warning(
+                f"Error occurred during sampling browser(s): {browsers}, "
+                "but was suppressed with fallback.",
+            )
+        useragents = self._sample(pool, n, weighted)
+
+        if stats is not None:
+            stats.record_pick(
+                _stats_key(browsers), n, not pool.indices, perf_counter() - start
+            )
+        return useragents
+
+    def _sample(self, pool: _Pool, n: int, weighted: Optional[bool]) -> list[str]:
+        """Pick many user agent strings from a pool.
+
+        Args:
+            pool (_Pool): The pool to pick from.
+            n (int): The number of user agents to get.
+            weighted (Optional[bool]): Whether to pick user agents proportionally to their
+                usage percentage. If None, use the `weighted` setting of the instance.
+
+        Raises:
+            ValueError: If `n` is negative.
+
+        Returns:
+            list[str]: The `n` user agent strings, or the fallback user agent `n` times if the
+                pool is empty.
+        """
+        n = operator.index(n)
+        if n < 0:
+            raise ValueError(f"n must not be negative but got {n}.")
+        if weighted is None:
+            weighted = self.weighted
+
+        indices = pool.indices
+        if not indices:
+            return [self.fallback] * n
+        rng = self._get_random()
+        if weighted:
+            draw = self._alias_table(pool).draw
+            rand = rng.random
+            picks = [indices[draw(rand)] for _ in range(n)]
+        else:
+            picks = rng.choices(indices, k=n)
+        return self._dataset.values("useragent", picks)  # type: ignore[union-attr]
+
+    def for_key(
+        self,
+        key: Hashable,
+        browsers: Union[str, list[str]] = "random",
+        weighted: Optional[bool] = None,
+    ) -> str:
+        """Get the user agent string assigned to a key, eg. a session id or a proxy address.
+
+        The same key always gets the same user agent, without storing anything per key: the key
+        is hashed (see `fake_useragent.sampling.stable_hash`) and mapped onto the user agents
+        matching the filters. The mapping doesn't depend on the random generator or the process,
+        so separate processes and machines agree on it as long as they use the same data and
+        filters. Unweighted mappings use a consistent hash over the matching user agents in data
+        file order: appending user agents at the end of that pool only moves the keys that now
+        get one of the new user agents. Inserting or removing user agents elsewhere, or weighted
+        mappings, can reassign most keys.
+
+        Args:
+            key (Hashable): The key. Strings and bytes are hashed by their value, other keys by
+                their `repr()`, which must not change between processes (it doesn't for numbers
+                and tuples of strings and numbers).
+            browsers (Union[str, list[str]], optional): The browser name(s) to get. Special
+                keyword "random" will return user agents from any browser allowed by the
+                instance. Defaults to "random".
+            weighted (Optional[bool], optional): Whether to assign user agents proportionally to
+                their usage percentage. If None, use the `weighted` setting of the instance.
+                Defaults to None.
+
+        Returns:
+            str: The user agent string assigned to the key.
+        """
+        if weighted is None:
+            weighted = self.weighted
+
+        stats = self._stats
+        pool = self._pool(browsers)
+        start = perf_counter() if stats is not None else 0.0
+        indices = pool.indices
+        if not indices:
+            logger.warning(
+                f"Error occurred during getting browser(s): {browsers}, "
+                "but was suppressed with fallback.",
+            )
+            useragent = self.fallback
+        else:
+            hashed = stable_hash(key)
+            if weighted:
+                # The hash stands in for the uniform random number of a regular draw.
+                uniform = hashed / 2**64
+                idx = indices[self._alias_table(pool).draw(lambda: uniform)]
+            else:
+                idx = indices[jump_hash(hashed, len(indices))]
+            useragent = self._dataset.useragent(idx)  # type: ignore[union-attr]
+
+        if stats is not None:
+            stats.record_pick(
+                _stats_key(browsers), 1, not indices, perf_counter() - start
+            )
+        return useragent
+
+    def rotation(
+        self,
+        browsers: Union[str, list[str]] = "random",
+        shuffle: bool = True,
+        weighted: Optional[bool] = None,
+    ) -> Iterator[str]:
+        """Iterate over the user agents matching the filters without repeats, endlessly.
+
+        Every round yields each user agent once (a random permutation if `shuffle`), then the
+        next round starts. The permutation is built lazily, one Fisher-Yates swap per user
+        agent, so creating the iterator and every step are cheap. Weighted rotations schedule
+        each round with systematic sampling instead (see
+        `fake_useragent.sampling.systematic_sample`): in a round of `n` user agents, each one
+        appears its expected number of times by usage percentage, rounded up or down, so rarely
+        used user agents appear at most once per round.
+
+        The iterator must not be shared between threads without a lock.
+
+        Args:
+            browsers (Union[str, list[str]], optional): The browser name(s) to get. Special
+                keyword "random" will return user agents from any browser allowed by the
+                instance. Defaults to "random".
+            shuffle (bool, optional): If True, shuffle every round. If False, every round
+                follows the data file order. Defaults to True.
+            weighted (Optional[bool], optional): Whether to schedule user agents
+                proportionally to their usage percentage. If None, use the `weighted` setting
+                of the instance. Defaults to None.
+
+        Yields:
+            str: The next user agent string, or the fallback user agent if no user agent
+                matches.
+        """
+        if weighted is None:
+            weighted = self.weighted
+        pool = self._pool(browsers)
+        if not pool.indices:
+            logger.warning(
+                f"Error occurred during getting browser(s): {browsers}, "
+                "but was suppressed with fallback.",
+            )
+        return self._rotate(pool, _stats_key(browsers), shuffle, weighted)
+
+    def _rotate(
+        self, pool: _Pool, key: str, shuffle: bool, weighted: bool
+    ) -> Iterator[str]:
+        """Generate the rotation of `rotation()`.
+
+        Args:
+            pool (_Pool): The pool to rotate through.
+            key (str): The requested browser(s), for the statistics.
+            shuffle (bool): Whether to shuffle every round.
+            weighted (bool): Whether to schedule rounds by usage percentage.
+
+        Yields:
+            str: The next user agent string.
+        """
+        stats = self._stats
+        indices = pool.indices
+        if not indices:
+            while True:
+                if stats is not None:
+                    stats.record_pick(key, 1, True, 0.0)
+                yield self.fallback
+
+        rng = self._get_random()
+        useragent = self._dataset.useragent  # type: ignore[union-attr]
+        size = len(indices)
+        weights = self._dataset.values("percent", indices) if weighted else None  # type: ignore[union-attr]
+        if weights is not None and not sum(weights) > 0:
+            weights = (
+                None  # Without any usage statistics, rotate through all user agents.
+            )
+        order = list(indices)
+        while True:
+            if weights is not None:
+                order = [
+                    indices[i] for i in systematic_sample(weights, size, rng.random())
+                ]
+            for i in range(size):
+                start = perf_counter() if stats is not None else 0.0
+                if shuffle:
+                    # Fisher-Yates, one step at a time: swap a random not yet visited user
+                    # agent into position i.
+                    j = rng.randrange(i, size)
+                    order[i], order[j] = order[j], order[i]
+                result = useragent(order[i])
+                if stats is not None:
+                    stats.record_pick(key, 1, False, perf_counter() - start)
+                yield result
+
+    def query(  # noqa: PLR0913
+        self,
+        browser: Optional[Union[str, Iterable[str]]] = None,
+        os: Optional[Union[str, Iterable[str]]] = None,
+        type: Optional[Union[str, Iterable[str]]] = None,
+        device_brand: Optional[Union[str, Iterable[str]]] = None,
+        platform: Optional[Union[str, Iterable[str]]] = None,
+        *,
+        min_version: Optional[float] = None,
+        max_version: Optional[float] = None,
+        os_version_min: Optional[Union[str, float]] = None,
+        exclude: Optional[dict[str, Union[str, Iterable[str]]]] = None,
+    ) -> UserAgentQuery:
+        """Find the user agents matching all the given criteria, on top of the instance filters.
+
+        Every criterion is answered with precomputed bitsets over the user agents (see
+        `fake_useragent.query.BitmapIndex`), and the matching user agents of every distinct
+        query are cached like the pools of `getBrowser()`, so repeated queries are cheap.
+
+        Args:
+            browser (Optional[Union[str, Iterable[str]]], optional): Allowed browser name(s),
+                eg. "Chrome Mobile". Defaults to None (any).
+            os (Optional[Union[str, Iterable[str]]], optional): Allowed operating system
+                name(s). Defaults to None (any).
+            type (Optional[Union[str, Iterable[str]]], optional): Allowed device type(s), eg.
+                "mobile". Defaults to None (any).
+            device_brand (Optional[Union[str, Iterable[str]]], optional): Allowed device
+                brand(s), eg. "Samsung". Defaults to None (any).
+            platform (Optional[Union[str, Iterable[str]]], optional): Allowed platform(s), eg.
+                "Win32". Defaults to None (any).
+            min_version (Optional[float], optional): Minimum major and minor browser version.
+                Defaults to None.
+            max_version (Optional[float], optional): Maximum major and minor browser version.
+                Defaults to None.
+            os_version_min (Optional[Union[str, float]], optional): Minimum operating system
+                version, eg. 13 or "10.15". User agents without a numeric operating system
+                version don't match. Defaults to None.
+            exclude (Optional[dict[str, Union[str, Iterable[str]]]], optional): Values to
+                exclude, by field name (one of `fake_useragent.query.QUERY_FIELDS`), eg.
+                `{"browser": "Chrome Mobile WebView"}`. Defaults to None.
+
+        Raises:
+            ValueError: If `exclude` names an unknown field, or `os_version_min` is not a
+                version.
+
+        Returns:
+            UserAgentQuery: The matching user agents.
+        """
+        includes = tuple(
+            (field, _query_values(values))
+            for field, values in zip(
+                QUERY_FIELDS, (browser, os, type, device_brand, platform)
+            )
+            if values is not None
+        )
+        excludes = frozenset(
+            (field, _query_values(values)) for field, values in (exclude or {}).items()
+        )
+        unknown = {field for field, _ in excludes} - set(QUERY_FIELDS)
+        if unknown:
+            msg = f"exclude must only use fields {QUERY_FIELDS} but got {sorted(unknown)}."
+            raise ValueError(msg)
+        min_os_version = None
+        if os_version_min is not None:
+            min_os_version = version_tuple(os_version_min)
+            if min_os_version is None:
+                msg = f"os_version_min must be a version but got {os_version_min!r}."
+                raise ValueError(msg)
+        if min_version is not None:
+            min_version = _ensure_float(min_version)
+        if max_version is not None:
+            max_version = _ensure_float(max_version)
+
+        if self._dataset is None:
+            self.warmup()
+        key = ("query", includes, excludes, min_version, max_version, min_os_version)
+        pool = self._cached_pool(
+            key,
+            lambda: self._compile_query(
+                includes, excludes, min_version, max_version, min_os_version
+            ),
+            lambda: "query",
+        )
+        return UserAgentQuery(self, pool)
+
+    def _compile_query(
+        self,
+        includes: tuple[tuple[str, frozenset[str]], ...],
+        excludes: frozenset[tuple[str, frozenset[str]]],
+        min_version: Optional[float],
+        max_version: Optional[float],
+        min_os_version: Optional[tuple[int, ...]],
+    ) -> _Pool:
+        """Create the pool of user agents matching a query, see `query()`.
+
+        Args:
+            includes (tuple[tuple[str, frozenset[str]], ...]): Allowed values, by field.
+            excludes (frozenset[tuple[str, frozenset[str]]]): Excluded values, by field.
+            min_version (Optional[float]): Minimum major and minor browser version.
+            max_version (Optional[float]): Maximum major and minor browser version.
+            min_os_version (Optional[tuple[int, ...]]): Minimum operating system version.
+
+        Returns:
+            _Pool: The pool, which is empty if no allowed user agent matches.
+        """
+        index = self._bitmap_index
+        if index is None:
+            index = self._bitmap_index = BitmapIndex(self._dataset, self._indices)  # type: ignore[arg-type]
+
+        bitset = index.all
+        for field, values in includes:
+            bitset &= index.matching(field, values)
+        for field, values in excludes:
+            bitset &= ~index.matching(field, values)
+        if min_version is not None:
+            bitset &= index.matching_where(
+                "browser_version_major_minor", lambda version: version >= min_version
+            )
+        if max_version is not None:
+            bitset &= index.matching_where(
+                "browser_version_major_minor", lambda version: version <= max_version
+            )
+        if min_os_version is not None:
+            bitset &= index.matching_where(
+                "os_version",
+                lambda version: (version_tuple(version) or ()) >= min_os_version,
+            )
+        return _Pool(index.indices(bitset))
+
+    def _pick(self, pool: _Pool) -> int:
+        """Pick a random user agent from a pool.
+
+        Args:
+            pool (_Pool): The pool returned by `_pool`.
+
+        Raises:
+            IndexError: If the pool is empty.
+
+        Returns:
+            int: The dataset index of the picked user agent, weighted by usage percentage if the
+                instance is `weighted`.
+        """
+        indices = pool.indices
+        if not indices:
+            raise IndexError("No user agents match the filters")
+
+        if self.weighted:
+            return indices[self._alias_table(pool).draw(self._get_random().random)]
+        return indices[self._get_random().randrange(len(indices))]
 
     def _filter_useragents(
         self, browsers_to_filter: Optional[Union[str, list[str]]] = None
@@ -247,7 +1334,7 @@ class FakeUserAgent:
         """Filter the user agents based on filters set in the instance, and an optional browser name.
 
         User agents from the data file are filtered based on the attributes passed upon
-        instantiation.
+        instantiation. The filtering itself happens once, when the instance is created.
 
         Args:
             browsers_to_filter (Union[str, None], optional): A specific browser name you want results for in
@@ -256,33 +1343,42 @@ class FakeUserAgent:
         Returns:
             list[BrowserUserAgentData]: A filtered list of user agents.
         """
-        # Filter based on browser, os, typem browser version and percentage (weight).
-
-        filtered_useragents = list(
-            filter(
-                lambda x: x["browser"] in self.browsers
-                and x["os"] in self.os
-                and x["type"]
-                in self.platforms  # We check platform on type here (I know it's confusing)
-                and x["browser_version_major_minor"] >= self.min_version
-                and x["percent"] >= self.min_percentage,
-                self.data_browsers,
-            )
+        indices = self._pool(browsers_to_filter).indices  # type: ignore[arg-type]
+        return [self._dataset[idx] for idx in indices]  # type: ignore[index]
+
+    def _observed_attr(self, attr: str) -> str:
+        """Get a user agent string for an attribute lookup, recording it in the statistics.
+
+        Args:
+            attr (str): The attribute name.
+
+        Returns:
+            str: The user agent string.
+        """
+        pool = self._attr_pool(attr)
+        start = perf_counter()
+        if not pool.indices:
+            useragent = self.fallback
+        else:
+            useragent = self._dataset.useragent(self._pick(pool))  # type: ignore[union-attr]
+        self._stats.record_pick(  # type: ignore[union-attr]
+            attr, 1, not pool.indices, perf_counter() - start
         )
+        return useragent
 
-        # Filter based on a specific browser name(s), if set.
-        if browsers_to_filter:
-            # Ensure browsers_to_filter is always a list.
-            if isinstance(browsers_to_filter, str):
-                browsers_to_filter = [browsers_to_filter]
+    def stats(self) -> Optional[UserAgentStats]:
+        """Get statistics about the use of this instance.
 
-            filtered_useragents = list(
-                filter(
-                    lambda x: x["browser"] in browsers_to_filter, filtered_useragents
-                )
-            )
+        Statistics are only collected if the instance was created with `collect_stats=True` or
+        an `on_pick` hook.
 
-        return filtered_useragents
+        Returns:
+            Optional[UserAgentStats]: The statistics collected so far, or None if statistics
+                are not collected.
+        """
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
 
     def __getitem__(self, attr: str) -> Union[str, Any]:
         """Get a user agent by key lookup, as if it were a dictionary (i.e., `ua['random']`).
@@ -300,27 +1396,40 @@ class FakeUserAgent:
         """Get a user agent string by attribute lookup.
 
         Args:
-            attr (str): Browser name to get. Special keyword "random" will return a user agent from
-                any browser allowed by the instance's `self.browsers` filter.
+            attr (str): Browser name to get. Besides the browser names in the data, this can be
+                a case-insensitive browser name or one of the aliases in `BROWSER_ALIASES` (eg.
+                "ff"). Special keyword "random" will return a user agent from any browser
+                allowed by the instance's `self.browsers` filter.
 
         Returns:
             Union[str, Any]: The user agent string if not a `self.safe_attr`, otherwise the
                 attribute value.
         """
         if isinstance(attr, str):
+            # Instances created without __init__, eg. while `copy.copy()` or `pickle` restore
+            # them, have no state to look names up with yet.
+            if "_stats" not in self.__dict__:
+                msg = f"{type(self).__name__!r} object has no attribute {attr!r}"
+                raise AttributeError(msg)
             if _is_magic_name(attr) or attr in self.safe_attrs:
                 return super(UserAgent, self).__getattribute__(attr)
+            if self._stats is not None:
+                return self._observed_attr(attr)
+            pool = self._attr_pool(attr)
+            if not pool.indices:
+                return self.fallback
+            return self._dataset.useragent(self._pick(pool))  # type: ignore[union-attr]
         elif isinstance(attr, list):
             for a in attr:
                 if a in self.safe_attrs:
                     return super(UserAgent, self).__getattribute__(a)
 
-        return self.getBrowser(attr)["useragent"]
+        return self._get_useragent(attr)
 
     @property
     def chrome(self) -> str:
         """Get a random Chrome user agent."""
-        return self.__getattr__(["Chrome", "Chrome Mobile", "Chrome Mobile iOS"])
+        return self.__getattr__("chrome")
 
     @property
     def googlechrome(self) -> str:
@@ -335,27 +1444,27 @@ class FakeUserAgent:
     @property
     def firefox(self) -> str:
         """Get a random Firefox user agent."""
-        return self.__getattr__(["Firefox", "Firefox Mobile", "Firefox iOS"])
+        return self.__getattr__("firefox")
 
     @property
     def safari(self) -> str:
         """Get a random Safari user agent."""
-        return self.__getattr__(["Safari", "Mobile Safari"])
+        return self.__getattr__("safari")
 
     @property
     def opera(self) -> str:
         """Get a random Opera user agent."""
-        return self.__getattr__(["Opera", "Opera Mobile"])
+        return self.__getattr__("opera")
 
     @property
     def google(self) -> str:
         """Get a random Google user agent."""
-        return self.__getattr__(["Google"])
+        return self.__getattr__("google")
 
     @property
     def edge(self) -> str:
         """Get a random Edge user agent."""
-        return self.__getattr__(["Edge", "Edge Mobile"])
+        return self.__getattr__("edge")
 
     @property
     def random(self) -> str:
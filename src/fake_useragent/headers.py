@@ -0,0 +1,128 @@
+"""Request headers matching a browser user agent, including User-Agent Client Hints."""
+
+import re
+from typing import Optional
+
+from fake_useragent.utils import BrowserUserAgentData
+
+DEFAULT_ACCEPT_LANGUAGE = "en-US,en;q=0.9"
+"""The default value of the `Accept-Language` header."""
+
+CHROMIUM_BRANDS = {
+    "Chrome": "Google Chrome",
+    "Chrome Mobile": "Google Chrome",
+    "Chrome Mobile WebView": "Android WebView",
+    "Edge": "Microsoft Edge",
+    "Edge Mobile": "Microsoft Edge",
+    "Opera": "Opera",
+    "Opera Mobile": "Opera",
+    "Samsung Internet": "Samsung Internet",
+    "Yandex Browser": "YaBrowser",
+    "Whale": "Whale",
+}
+"""Chromium based browsers that send Client Hints, with the brand they send in `Sec-CH-UA`."""
+
+CLIENT_HINT_PLATFORMS = {
+    "Windows": "Windows",
+    "Mac OS X": "macOS",
+    "Linux": "Linux",
+    "Ubuntu": "Linux",
+    "Chrome OS": "Chrome OS",
+    "Android": "Android",
+    "win32": "Windows",  # The operating system of the fallback user agent.
+}
+"""Operating system names, mapped to their `Sec-CH-UA-Platform` value."""
+
+CLIENT_HINTS_MIN_VERSION = 89
+"""The first Chromium major version that sends Client Hints by default."""
+
+_ACCEPT_CHROMIUM = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,"
+    "image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
+)
+_ACCEPT_FIREFOX = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,"
+    "image/png,image/svg+xml,*/*;q=0.8"
+)
+_ACCEPT_OTHER = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+_CHROMIUM_VERSION = re.compile(r"Chrome/(\d+)")
+# Chromium's "GREASE" brand, which is added to the brand list so servers don't rely on its
+# exact contents. Its characters, version and position depend on the major version.
+_GREASE_CHARS = (" ", "(", ":", "-", ".", "/", ")", ";", "=", "?", "_")
+_GREASE_VERSIONS = ("8", "99", "24")
+_GREASE_ORDERS = ((0, 1, 2), (0, 2, 1), (1, 0, 2), (1, 2, 0), (2, 0, 1), (2, 1, 0))
+
+
+def _sec_ch_ua(brand: str, brand_version: str, chromium_version: int) -> str:
+    """Build the `Sec-CH-UA` brand list the way Chromium does.
+
+    Args:
+        brand (str): The browser brand, eg. "Google Chrome".
+        brand_version (str): The major version of the browser.
+        chromium_version (int): The major version of Chromium the browser is based on.
+
+    Returns:
+        str: The header value.
+    """
+    seed = chromium_version
+    grease = (
+        f"Not{_GREASE_CHARS[seed % len(_GREASE_CHARS)]}A"
+        f"{_GREASE_CHARS[(seed + 1) % len(_GREASE_CHARS)]}Brand"
+    )
+    brands = [
+        (grease, _GREASE_VERSIONS[seed % len(_GREASE_VERSIONS)]),
+        ("Chromium", str(chromium_version)),
+        (brand, brand_version),
+    ]
+    ordered = [brands[0]] * len(brands)
+    for position, brand_version_pair in zip(
+        _GREASE_ORDERS[seed % len(_GREASE_ORDERS)], brands
+    ):
+        ordered[position] = brand_version_pair
+    return ", ".join(f'"{name}";v="{version}"' for name, version in ordered)
+
+
+def build_headers(
+    record: BrowserUserAgentData,
+    accept_language: Optional[str] = DEFAULT_ACCEPT_LANGUAGE,
+) -> dict[str, str]:
+    """Build request headers that are consistent with a browser user agent.
+
+    Chromium based browsers (see `CHROMIUM_BRANDS`) also get the default User-Agent Client
+    Hints headers: `Sec-CH-UA`, `Sec-CH-UA-Mobile` and `Sec-CH-UA-Platform`, unless they are
+    older than `CLIENT_HINTS_MIN_VERSION` or run on iOS, where all browsers use WebKit.
+
+    Args:
+        record (BrowserUserAgentData): The user agent, eg. from `FakeUserAgent.getBrowser()`.
+        accept_language (Optional[str], optional): The `Accept-Language` header. If None, the
+            header is left out. Defaults to `DEFAULT_ACCEPT_LANGUAGE`.
+
+    Returns:
+        dict[str, str]: The headers.
+    """
+    useragent = record["useragent"]
+    browser = record["browser"] or ""
+    headers = {"User-Agent": useragent}
+
+    brand = CHROMIUM_BRANDS.get(browser)
+    chromium = _CHROMIUM_VERSION.search(useragent) if brand else None
+    if chromium and record["os"] != "iOS":
+        chromium_version = int(chromium.group(1))
+        if chromium_version >= CLIENT_HINTS_MIN_VERSION:
+            brand_version = record["browser_version"].split(".")[0] or str(
+                chromium_version
+            )
+            headers["Sec-CH-UA"] = _sec_ch_ua(brand, brand_version, chromium_version)  # type: ignore[arg-type]
+            headers["Sec-CH-UA-Mobile"] = "?1" if record["type"] == "mobile" else "?0"
+            platform = CLIENT_HINT_PLATFORMS.get(record["os"] or "", "Unknown")
+            headers["Sec-CH-UA-Platform"] = f'"{platform}"'
+        headers["Accept"] = _ACCEPT_CHROMIUM
+    elif browser.startswith("Firefox"):
+        headers["Accept"] = _ACCEPT_FIREFOX
+    else:
+        headers["Accept"] = _ACCEPT_OTHER
+
+    if accept_language is not None:
+        headers["Accept-Language"] = accept_language
+    return headers
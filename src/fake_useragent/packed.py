@@ -0,0 +1,338 @@
+"""Compact binary ("packed") format for the browser user agent data.
+
+The packed file stores the same records as `browsers.jsonl`, but column by column: every distinct
+string is stored once in a string table, string fields are stored as 32-bit codes into that table
+and float fields as packed doubles. Loading it avoids parsing JSON and repeating the same keys and
+values for every record.
+
+Layout (all integers and floats are little-endian, every section starts 8-byte aligned):
+
+- Header: magic `b"FUAP"`, format version (u16), reserved (u16), record count (u32), string count
+  (u32) and metadata size in bytes (u32).
+- Metadata: a UTF-8 encoded JSON object.
+- String offsets: string count + 1 u32 byte offsets into the string blob.
+- String blob: all strings of the string table, UTF-8 encoded and concatenated.
+- One f64 column per field in `FLOAT_FIELDS`, in that order.
+- One u32 code column per field in `STRING_FIELDS`, in that order. `NULL` encodes `None`.
+"""
+
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+from fake_useragent.errors import FakeUserAgentError
+
+if TYPE_CHECKING:
+    from fake_useragent.utils import BrowserUserAgentData
+
+MAGIC = b"FUAP"
+"""Magic bytes every packed file starts with."""
+VERSION = 1
+"""Current version of the packed format."""
+NULL = 0xFFFFFFFF
+"""String code that encodes `None`."""
+FIELDS = (
+    "useragent",
+    "percent",
+    "type",
+    "device_brand",
+    "browser",
+    "browser_version",
+    "browser_version_major_minor",
+    "os",
+    "os_version",
+    "platform",
+)
+"""All fields of a record, in the order of `BrowserUserAgentData`."""
+FLOAT_FIELDS = ("percent", "browser_version_major_minor")
+"""Fields stored as f64 columns."""
+STRING_FIELDS = tuple(field for field in FIELDS if field not in FLOAT_FIELDS)
+"""Fields stored as u32 code columns into the string table."""
+
+_HEADER = struct.Struct("<4sHHIII")
+_ALIGNMENT = 8
+UINT32_TYPECODE = "I" if array("I").itemsize == 4 else "L"  # noqa: PLR2004
+"""The `array` typecode of an unsigned 32-bit integer on this platform."""
+_BIG_ENDIAN = sys.byteorder == "big"
+
+
+def _align(offset: int) -> int:
+    """Round the given offset up to the section alignment.
+
+    Args:
+        offset (int): The offset to align.
+
+    Returns:
+        int: The aligned offset.
+    """
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _to_bytes(column: array) -> bytes:
+    """Convert an array to little-endian bytes.
+
+    Args:
+        column (array): The array to convert.
+
+    Returns:
+        bytes: The little-endian representation of the array.
+    """
+    if _BIG_ENDIAN:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+class PackedData:
+    """The columns of a packed file.
+
+    Args:
+        count (int): Number of records.
+        metadata (dict[str, Any]): The metadata stored in the file.
+        string_offsets (Sequence[int]): Byte offsets of the strings in `string_blob`.
+        string_blob (Union[bytes, memoryview]): The UTF-8 encoded strings of the string table.
+        columns (dict[str, Sequence]): A float column per field in `FLOAT_FIELDS` and a code
+            column per field in `STRING_FIELDS`.
+    """
+
+    __slots__ = ("columns", "count", "metadata", "string_blob", "string_offsets")
+
+    def __init__(
+        self,
+        count: int,
+        metadata: dict[str, Any],
+        string_offsets: Sequence[int],
+        string_blob: Union[bytes, memoryview],
+        columns: dict[str, Sequence],
+    ):
+        self.count = count
+        self.metadata = metadata
+        self.string_offsets = string_offsets
+        self.string_blob = string_blob
+        self.columns = columns
+
+    def string(self, code: int) -> Optional[str]:
+        """Decode a single string of the string table.
+
+        Args:
+            code (int): The string code, as stored in a code column.
+
+        Raises:
+            FakeUserAgentError: If the code or the string is invalid.
+
+        Returns:
+            Optional[str]: The decoded string, or None for the `NULL` code.
+        """
+        if code == NULL:
+            return None
+        try:
+            start, end = self.string_offsets[code], self.string_offsets[code + 1]
+            return str(self.string_blob[start:end], "utf-8")
+        except (IndexError, UnicodeDecodeError) as exc:
+            raise FakeUserAgentError(
+                f"Packed data has an invalid string {code}"
+            ) from exc
+
+    def strings(self) -> list[str]:
+        """Decode the whole string table.
+
+        Raises:
+            FakeUserAgentError: If a string is invalid.
+
+        Returns:
+            list[str]: The strings, indexed by their code.
+        """
+        offsets, blob = self.string_offsets, self.string_blob
+        try:
+            return [
+                str(blob[start:end], "utf-8")
+                for start, end in zip(offsets, offsets[1:])
+            ]
+        except UnicodeDecodeError as exc:
+            raise FakeUserAgentError("Packed data has an invalid string") from exc
+
+    def records(self) -> list["BrowserUserAgentData"]:
+        """Decode all records.
+
+        Raises:
+            FakeUserAgentError: If a string or a string code is invalid.
+
+        Returns:
+            list[BrowserUserAgentData]: The records, in the order they were packed.
+        """
+        strings: list[Optional[str]] = self.strings()
+        strings.append(None)
+        null_code = len(strings) - 1
+
+        columns = []
+        for field in FIELDS:
+            column = self.columns[field]
+            if field in STRING_FIELDS:
+                try:
+                    column = [
+                        strings[null_code if code == NULL else code] for code in column
+                    ]
+                except IndexError as exc:
+                    raise FakeUserAgentError(
+                        f"Packed data has an invalid {field} string code"
+                    ) from exc
+            columns.append(column)
+        return [dict(zip(FIELDS, values)) for values in zip(*columns)]  # type: ignore[misc]
+
+
+def pack(
+    records: Iterable["BrowserUserAgentData"], metadata: Optional[dict[str, Any]] = None
+) -> bytes:
+    """Pack records into the packed format.
+
+    Args:
+        records (Iterable[BrowserUserAgentData]): The records to pack.
+        metadata (Optional[dict[str, Any]], optional): JSON serializable metadata to store in the
+            file. Defaults to None.
+
+    Raises:
+        FakeUserAgentError: If a record misses a field or has a value of the wrong type.
+
+    Returns:
+        bytes: The packed file contents.
+    """
+    string_codes: dict[str, int] = {}
+    floats = {field: array("d") for field in FLOAT_FIELDS}
+    codes = {field: array(UINT32_TYPECODE) for field in STRING_FIELDS}
+    count = 0
+    try:
+        for record in records:
+            for field in FLOAT_FIELDS:
+                floats[field].append(record[field])  # type: ignore[literal-required]
+            for field in STRING_FIELDS:
+                value = record[field]  # type: ignore[literal-required]
+                if value is None:
+                    codes[field].append(NULL)
+                else:
+                    codes[field].append(
+                        string_codes.setdefault(str(value), len(string_codes))
+                    )
+            count += 1
+    except (KeyError, TypeError) as exc:
+        raise FakeUserAgentError(f"Unable to pack record {count}") from exc
+
+    encoded = [string.encode("utf-8") for string in string_codes]
+    string_offsets = array(UINT32_TYPECODE, [0])
+    for string in encoded:
+        string_offsets.append(string_offsets[-1] + len(string))
+    meta = json.dumps(metadata or {}).encode("utf-8")
+
+    sections = [
+        meta,
+        _to_bytes(string_offsets),
+        b"".join(encoded),
+        *(_to_bytes(floats[field]) for field in FLOAT_FIELDS),
+        *(_to_bytes(codes[field]) for field in STRING_FIELDS),
+    ]
+    output = bytearray(
+        _HEADER.pack(MAGIC, VERSION, 0, count, len(string_codes), len(meta))
+    )
+    for section in sections:
+        output += bytes(_align(len(output)) - len(output))
+        output += section
+    return bytes(output)
+
+
+def unpack(
+    buffer: Union[bytes, bytearray, memoryview], copy: bool = True
+) -> PackedData:
+    """Unpack the columns of a packed file.
+
+    Args:
+        buffer (Union[bytes, bytearray, memoryview]): The packed file contents. Any object
+            supporting the buffer protocol works, including an `mmap.mmap`.
+        copy (bool, optional): If True, copy the columns into arrays. If False, the columns are
+            zero-copy views into `buffer`, which must then stay open while they are in use. On
+            big-endian platforms the columns are always copied. Defaults to True.
+
+    Raises:
+        FakeUserAgentError: If the buffer is not a valid packed file.
+
+    Returns:
+        PackedData: The unpacked columns.
+    """
+    view = memoryview(buffer).cast("B")
+    try:
+        magic, version, _, count, n_strings, meta_size = _HEADER.unpack_from(view)
+    except struct.error as exc:
+        raise FakeUserAgentError("Packed data is truncated") from exc
+    if magic != MAGIC:
+        raise FakeUserAgentError("Packed data has an invalid magic number")
+    if version != VERSION:
+        raise FakeUserAgentError(f"Unsupported packed data version {version}")
+
+    offset = _HEADER.size
+
+    def section(size: int) -> memoryview:
+        nonlocal offset
+        start = _align(offset)
+        offset = start + size
+        if offset > len(view):
+            raise FakeUserAgentError("Packed data is truncated")
+        return view[start:offset]
+
+    def column(typecode: str, length: int) -> Sequence:
+        data = section(length * array(typecode).itemsize)
+        if copy or _BIG_ENDIAN:
+            values = array(typecode)
+            values.frombytes(data)
+            if _BIG_ENDIAN:
+                values.byteswap()
+            return values
+        return data.cast(typecode)
+
+    try:
+        metadata = json.loads(str(section(meta_size), "utf-8"))
+    except ValueError as exc:  # Also raised for invalid UTF-8.
+        raise FakeUserAgentError("Packed data has invalid metadata") from exc
+    if not isinstance(metadata, dict):
+        raise FakeUserAgentError("Packed data has invalid metadata")
+    string_offsets = column(UINT32_TYPECODE, n_strings + 1)
+    if string_offsets[0] != 0 or any(
+        start > end for start, end in zip(string_offsets, string_offsets[1:])
+    ):
+        raise FakeUserAgentError("Packed data has invalid string offsets")
+    string_blob = section(string_offsets[-1])
+    if copy:
+        string_blob = string_blob.tobytes()
+    columns = {field: column("d", count) for field in FLOAT_FIELDS}
+    columns.update({field: column(UINT32_TYPECODE, count) for field in STRING_FIELDS})
+
+    return PackedData(count, metadata, string_offsets, string_blob, columns)
+
+
+def write_packed(
+    records: Iterable["BrowserUserAgentData"],
+    path: Union[str, Path],
+    metadata: Optional[dict[str, Any]] = None,
+) -> None:
+    """Pack records and write them to a file.
+
+    Args:
+        records (Iterable[BrowserUserAgentData]): The records to pack.
+        path (Union[str, Path]): The file to write.
+        metadata (Optional[dict[str, Any]], optional): JSON serializable metadata to store in the
+            file. Defaults to None.
+    """
+    Path(path).write_bytes(pack(records, metadata))
+
+
+def read_packed(path: Union[str, Path]) -> list["BrowserUserAgentData"]:
+    """Read all records from a packed file.
+
+    Args:
+        path (Union[str, Path]): The packed file to read.
+
+    Returns:
+        list[BrowserUserAgentData]: The records stored in the file.
+    """
+    return unpack(Path(path).read_bytes()).records()
@@ -0,0 +1,219 @@
+"""Multi-criteria queries over the user agents of a `FakeUserAgent`, see `FakeUserAgent.query()`.
+
+Queries are answered with bitsets: for every value of a field, a Python `int` has bit `i` set if
+the `i`-th user agent matching the instance filters has that value. Combining criteria is then a
+handful of `&`, `|` and `~` operations over all user agents at once, which run in C.
+"""
+
+import functools
+import itertools
+import re
+from collections.abc import Collection, Iterator, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+from fake_useragent.dataset import Dataset
+from fake_useragent.utils import BrowserUserAgentData
+
+if TYPE_CHECKING:
+    from fake_useragent.fake import FakeUserAgent, _Pool
+
+QUERY_FIELDS = ("browser", "os", "type", "device_brand", "platform")
+"""Fields that can be queried by value, and excluded by value."""
+
+_VERSION = re.compile(r"\d+(?:\.\d+)*")
+# Translates the digits of `bin()` to bytes that are falsy for "0" and truthy for "1".
+_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+@functools.lru_cache(maxsize=1024)
+def version_tuple(version: Any) -> Optional[tuple[int, ...]]:
+    """Convert a version, eg. "10.15.7" or 13, to a tuple of integers for comparisons.
+
+    Args:
+        version (Any): The version, a string or a number.
+
+    Returns:
+        Optional[tuple[int, ...]]: The numeric parts of the version, eg. `(10, 15, 7)`, or None
+            if it doesn't start with a number.
+    """
+    match = _VERSION.match(str(version)) if version is not None else None
+    if match is None:
+        return None
+    return tuple(int(part) for part in match.group().split("."))
+
+
+class BitmapIndex:
+    """Bitsets of the user agents having each value of a field.
+
+    Bit `i` of a bitset stands for the dataset index `indices[i]`. The bitsets of a field are
+    built on its first use.
+
+    Args:
+        dataset (Dataset): The user agent data.
+        indices (Sequence[int]): The dataset indices of the user agents to index, in ascending
+            order.
+    """
+
+    def __init__(self, dataset: Dataset, indices: Sequence[int]):
+        self._dataset = dataset
+        self._indices = indices
+        self._bitsets: dict[str, dict[Any, int]] = {}
+        self.all = (1 << len(indices)) - 1
+        """The bitset of all indexed user agents."""
+
+    def bitsets(self, field: str) -> dict[Any, int]:
+        """Get the bitsets of a field, building them on first use.
+
+        Args:
+            field (str): The name of the field, as in `BrowserUserAgentData`.
+
+        Returns:
+            dict[Any, int]: The bitset of every value of the field.
+        """
+        bitsets = self._bitsets.get(field)
+        if bitsets is None:
+            positions: dict[Any, list[int]] = {}
+            for pos, value in enumerate(self._dataset.values(field, self._indices)):
+                positions.setdefault(value, []).append(pos)
+            size = (len(self._indices) + 7) // 8
+            bitsets = {}
+            for value, value_positions in positions.items():
+                bits = bytearray(size)
+                for pos in value_positions:
+                    bits[pos >> 3] |= 1 << (pos & 7)
+                bitsets[value] = int.from_bytes(bits, "little")
+            self._bitsets[field] = bitsets
+        return bitsets
+
+    def matching(self, field: str, values: Collection[Any]) -> int:
+        """Get the bitset of the user agents having one of the given values.
+
+        Args:
+            field (str): The name of the field.
+            values (Collection[Any]): The wanted values.
+
+        Returns:
+            int: The bitset.
+        """
+        bitsets = self.bitsets(field)
+        result = 0
+        for value in values:
+            result |= bitsets.get(value, 0)
+        return result
+
+    def matching_where(self, field: str, predicate: Callable[[Any], bool]) -> int:
+        """Get the bitset of the user agents whose value satisfies a condition.
+
+        Args:
+            field (str): The name of the field.
+            predicate (Callable[[Any], bool]): Called once per distinct value of the field.
+
+        Returns:
+            int: The bitset.
+        """
+        result = 0
+        for value, bitset in self.bitsets(field).items():
+            if predicate(value):
+                result |= bitset
+        return result
+
+    def indices(self, bitset: int) -> list[int]:
+        """Get the dataset indices of the user agents in a bitset.
+
+        Args:
+            bitset (int): The bitset.
+
+        Returns:
+            list[int]: The dataset indices, in ascending order.
+        """
+        # bin() lists the bits from the highest, reverse it and drop the "0b" prefix.
+        bits = bin(bitset)[:1:-1].encode("ascii").translate(_BITS)
+        if bits.count(1) * 8 > len(bits):
+            return list(itertools.compress(self._indices, bits))
+        # Few matches, jump from one set bit to the next.
+        indices = self._indices
+        result = []
+        pos = bits.find(1)
+        while pos >= 0:
+            result.append(indices[pos])
+            pos = bits.find(1, pos + 1)
+        return result
+
+
+class UserAgentQuery:
+    """The user agents matching a query, see `FakeUserAgent.query()`.
+
+    Iterating over a query yields the matching user agent strings in data file order.
+
+    Args:
+        ua (FakeUserAgent): The instance the query was made on.
+        pool (_Pool): The pool of matching user agents.
+    """
+
+    __slots__ = ("_pool", "_ua")
+
+    def __init__(self, ua: "FakeUserAgent", pool: "_Pool"):
+        self._ua = ua
+        self._pool = pool
+
+    def __len__(self) -> int:
+        """Get the number of matching user agents.
+
+        Returns:
+            int: The number of matching user agents.
+        """
+        return len(self._pool.indices)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the matching user agent strings.
+
+        Returns:
+            Iterator[str]: The user agent strings, in data file order.
+        """
+        return iter(self._ua._dataset.values("useragent", self._pool.indices))  # type: ignore[union-attr]
+
+    @property
+    def random(self) -> str:
+        """A random matching user agent string, or the fallback user agent if none matches.
+
+        User agents are weighted by usage percentage if the instance is `weighted`.
+        """
+        try:
+            return self._ua._dataset.useragent(self._ua._pick(self._pool))  # type: ignore[union-attr]
+        except IndexError:
+            return self._ua.fallback
+
+    @property
+    def getRandom(self) -> BrowserUserAgentData:
+        """A random matching user agent with additional data, see `random`."""
+        try:
+            return self._ua._dataset[self._ua._pick(self._pool)]  # type: ignore[index]
+        except IndexError:
+            return self._ua._fallback_record()
+
+    def sample(self, n: int, weighted: Optional[bool] = None) -> list[str]:
+        """Get many matching user agent strings in one call, see `FakeUserAgent.sample()`.
+
+        Args:
+            n (int): The number of user agents to get.
+            weighted (Optional[bool], optional): Whether to pick user agents proportionally to
+                their usage percentage. If None, use the `weighted` setting of the instance.
+                Defaults to None.
+
+        Raises:
+            ValueError: If `n` is negative.
+
+        Returns:
+            list[str]: The `n` user agent strings, picked with replacement, or the fallback
+                user agent `n` times if none matches.
+        """
+        return self._ua._sample(self._pool, n, weighted)
+
+    def records(self) -> list[BrowserUserAgentData]:
+        """Get all matching user agents with additional data.
+
+        Returns:
+            list[BrowserUserAgentData]: The user agents, in data file order.
+        """
+        dataset = self._ua._dataset
+        return [dataset[idx] for idx in self._pool.indices]  # type: ignore[index]
@@ -0,0 +1,169 @@
+"""Weighted sampling and stable hashing helpers."""
+
+import hashlib
+from array import array
+from collections.abc import Hashable, Sequence
+from typing import Callable
+
+_UINT64 = 2**64
+
+
+class AliasTable:
+    """Walker's alias table for O(1) weighted draws of indices.
+
+    Building the table is O(n), after which every draw costs a single uniform random number, one
+    table lookup and one comparison, regardless of the number of weights.
+
+    Args:
+        weights (Sequence[float]): Non-negative weights, one per index to draw.
+
+    Raises:
+        ValueError: If `weights` is empty, contains negative values or sums to zero.
+    """
+
+    __slots__ = ("_alias", "_probability", "_size", "total")
+
+    def __init__(self, weights: Sequence[float]):
+        size = len(weights)
+        if not size:
+            raise ValueError("weights must not be empty.")
+        if min(weights) < 0:
+            raise ValueError("weights must not be negative.")
+        total = float(sum(weights))
+        if total <= 0:
+            raise ValueError("weights must not sum to zero.")
+
+        # Vose's variant: scale the weights so their average is 1, then pair every "small"
+        # index with a "large" one that tops up its column of the table.
+        scaled = [weight * size / total for weight in weights]
+        probability = array("d", [1.0]) * size
+        alias = array("q", range(size))
+        small = [idx for idx, weight in enumerate(scaled) if weight < 1.0]
+        large = [idx for idx, weight in enumerate(scaled) if weight >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            probability[less] = scaled[less]
+            alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+        # Anything left over is 1.0 up to rounding errors, so those columns never alias.
+
+        self._probability = probability
+        self._alias = alias
+        self._size = size
+        self.total = total
+        """The sum of all weights."""
+
+    def __len__(self) -> int:
+        """Get the number of indices in the table.
+
+        Returns:
+            int: The number of weights the table was built from.
+        """
+        return self._size
+
+    def draw(self, random: Callable[[], float]) -> int:
+        """Draw a single index with probability proportional to its weight.
+
+        Args:
+            random (Callable[[], float]): A function returning uniform floats in [0.0, 1.0),
+                such as `random.random`.
+
+        Returns:
+            int: The drawn index.
+        """
+        scaled = random() * self._size
+        idx = int(scaled)
+        if idx >= self._size:  # Guard against rounding up to the table size.
+            idx = self._size - 1
+        if scaled - idx < self._probability[idx]:
+            return idx
+        return self._alias[idx]
+
+
+def systematic_sample(weights: Sequence[float], k: int, offset: float) -> list[int]:
+    """Draw `k` indices with probability proportional to their weight, with systematic sampling.
+
+    The range of the cumulative weights is split into `k` equal strata, and every stratum
+    contributes the index at the same `offset` within it. Every index is drawn either the
+    floor or the ceiling of its expected number of times, `k * weight / sum(weights)`, which
+    keeps the counts much closer to the weights than independent draws.
+
+    Args:
+        weights (Sequence[float]): Non-negative weights, one per index to draw.
+        k (int): The number of indices to draw.
+        offset (float): A uniform random number in [0.0, 1.0).
+
+    Raises:
+        ValueError: If `weights` is empty, contains negative values or sums to zero.
+
+    Returns:
+        list[int]: The drawn indices, in ascending order.
+    """
+    if not weights:
+        raise ValueError("weights must not be empty.")
+    if min(weights) < 0:
+        raise ValueError("weights must not be negative.")
+    total = float(sum(weights))
+    if total <= 0:
+        raise ValueError("weights must not sum to zero.")
+
+    step = total / k if k else 0.0
+    point = offset * step
+    drawn = []
+    # Never step past the last positive weight, in case of rounding errors in the sums.
+    last = max(idx for idx, weight in enumerate(weights) if weight > 0)
+    idx, cumulative = 0, weights[0]
+    for _ in range(k):
+        while point >= cumulative and idx < last:
+            idx += 1
+            cumulative += weights[idx]
+        drawn.append(idx)
+        point += step
+    return drawn
+
+
+def stable_hash(key: Hashable) -> int:
+    """Hash a key to a 64-bit integer that is the same in every process and on every machine.
+
+    Unlike the built-in `hash()`, the result doesn't depend on `PYTHONHASHSEED`. Strings are
+    hashed by their UTF-8 encoding and bytes as they are; other keys by their `repr()`, which is
+    stable for numbers and tuples of strings and numbers.
+
+    Args:
+        key (Hashable): The key to hash.
+
+    Returns:
+        int: The hash, in [0, 2**64).
+    """
+    if isinstance(key, str):
+        data = key.encode("utf-8", "surrogatepass")
+    elif isinstance(key, (bytes, bytearray, memoryview)):
+        data = bytes(key)
+    else:
+        data = repr(key).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Map a 64-bit key onto one of a number of buckets, with Lamping and Veach's jump hash.
+
+    The mapping is consistent: when buckets are added at the end, only about 1/buckets of the
+    keys move, and only to the new buckets.
+
+    Args:
+        key (int): The key, in [0, 2**64), eg. from `stable_hash()`.
+        buckets (int): The number of buckets, at least 1.
+
+    Returns:
+        int: The bucket, in [0, buckets).
+    """
+    bucket, jump = -1, 0
+    while jump < buckets:
+        bucket = jump
+        key = (key * 2862933555777941757 + 1) % _UINT64
+        jump = int((bucket + 1) * (2**31 / ((key >> 33) + 1)))
+    return bucket
@@ -0,0 +1,121 @@
+"""Opt-in usage statistics for `FakeUserAgent` instances."""
+
+import threading
+from typing import Any, Callable, NamedTuple, Optional
+
+
+class PickEvent(NamedTuple):
+    """A request for user agents, as passed to the `on_pick` hook of a `FakeUserAgent`."""
+
+    key: str
+    """The requested browser(s), eg. "random", "chrome" or "Chrome,Edge"."""
+    count: int
+    """Number of user agents returned."""
+    fallback: bool
+    """Whether the fallback user agent was returned, because no user agent matched."""
+    duration: float
+    """Time taken, in seconds."""
+
+
+class UserAgentStats(NamedTuple):
+    """Statistics about the use of a `FakeUserAgent`, see `FakeUserAgent.stats()`."""
+
+    calls: dict[str, int]
+    """Number of requests per requested browser key (see `PickEvent.key`)."""
+    fallbacks: int
+    """Number of requests that returned the fallback user agent."""
+    pool_sizes: dict[str, int]
+    """Number of user agents matching the instance filters, per requested browser key. The
+    "random" key holds the number of user agents matching the instance filters at all."""
+    filter_time: float
+    """Time spent filtering the data and building user agent pools, in seconds."""
+    sample_time: float
+    """Time spent on requests for user agents, in seconds, not counting the time to build their
+    pools (see `filter_time`)."""
+
+
+class StatsCollector:
+    """Collects the statistics of a single `FakeUserAgent` instance.
+
+    Args:
+        hook (Optional[Callable[[PickEvent], None]], optional): Called after every request for
+            user agents. Defaults to None.
+    """
+
+    def __init__(self, hook: Optional[Callable[[PickEvent], None]] = None):
+        self.hook = hook
+        self._lock = threading.Lock()
+        self._calls: dict[str, int] = {}
+        self._fallbacks = 0
+        self._pool_sizes: dict[str, int] = {}
+        self._filter_time = 0.0
+        self._sample_time = 0.0
+
+    def record_pick(
+        self, key: str, count: int, fallback: bool, duration: float
+    ) -> None:
+        """Record a request for user agents, and call the hook.
+
+        Args:
+            key (str): The requested browser(s).
+            count (int): Number of user agents returned.
+            fallback (bool): Whether the fallback user agent was returned.
+            duration (float): Time taken, in seconds.
+        """
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            self._fallbacks += fallback
+            self._sample_time += duration
+        if self.hook is not None:
+            self.hook(PickEvent(key, count, fallback, duration))
+
+    def record_filter(self, key: str, size: int, duration: float) -> None:
+        """Record filtering the data or building a user agent pool.
+
+        Args:
+            key (str): The requested browser(s) the pool is for.
+            size (int): Number of user agents in the pool.
+            duration (float): Time taken, in seconds.
+        """
+        with self._lock:
+            self._pool_sizes[key] = size
+            self._filter_time += duration
+
+    def __getstate__(self) -> dict[str, Any]:
+        """Get the state to pickle or copy the collector with, without its lock.
+
+        Returns:
+            dict[str, Any]: The state.
+        """
+        with self._lock:
+            state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        """Restore the collector from the state returned by `__getstate__()`.
+
+        Args:
+            state (dict[str, Any]): The state.
+        """
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def after_fork_in_child(self) -> None:
+        """Replace the lock in a forked child process, in case another thread held it."""
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> UserAgentStats:
+        """Get a copy of the statistics collected so far.
+
+        Returns:
+            UserAgentStats: The statistics.
+        """
+        with self._lock:
+            return UserAgentStats(
+                dict(self._calls),
+                self._fallbacks,
+                dict(self._pool_sizes),
+                self._filter_time,
+                self._sample_time,
+            )
@@ -1,8 +1,13 @@
 """General utils for the fake_useragent package."""
 
+import gc
+import hashlib
 import json
+import os
 import sys
-from typing import TypedDict, Union
+import threading
+from collections.abc import Iterable, Sequence
+from typing import Optional, TypedDict, Union
 
 # We need files() from Python 3.10 or higher
 if sys.version_info >= (3, 10):
@@ -14,6 +19,7 @@ from pathlib import Path
 
 from fake_useragent.errors import FakeUserAgentError
 from fake_useragent.log import logger
+from fake_useragent.packed import PackedData, unpack
 
 
 class BrowserUserAgentData(TypedDict):
@@ -61,9 +67,84 @@ def find_browser_json_path() -> Path:
         raise FakeUserAgentError("Could not locate browsers.jsonl file") from exc
 
 
+def find_browser_packed_path() -> Path:
+    """Find the path to the packed browsers.bin file.
+
+    Returns:
+        Path: Path to the browsers.bin file.
+
+    Raises:
+        FakeUserAgentError: If unable to find the file.
+    """
+    try:
+        file_path = ilr.files("fake_useragent.data").joinpath("browsers.bin")
+        return Path(str(file_path))
+    except Exception as exc:
+        logger.warning(
+            "Unable to find local data/bin file using importlib-resources.",
+            exc_info=exc,
+        )
+        raise FakeUserAgentError("Could not locate browsers.bin file") from exc
+
+
+def source_digest(json_path: Path) -> str:
+    """Compute the digest of a `browsers.jsonl` file that is stored in the packed file metadata.
+
+    Args:
+        json_path (Path): Path to the `browsers.jsonl` file.
+
+    Returns:
+        str: The hex BLAKE2b digest of the file contents.
+    """
+    return hashlib.blake2b(json_path.read_bytes(), digest_size=16).hexdigest()
+
+
+def _packed_up_to_date(packed_data: PackedData, json_path: Path) -> bool:
+    """Check whether the included packed file was created from the current `browsers.jsonl` file.
+
+    The packed file is written together with `browsers.jsonl`, but only the latter might have
+    been updated. Hashing the file is still much faster than parsing it.
+
+    Args:
+        packed_data (PackedData): The unpacked `browsers.bin` file.
+        json_path (Path): Path to the `browsers.jsonl` file.
+
+    Returns:
+        bool: True if the packed file holds the digest of the `browsers.jsonl` file.
+    """
+    return packed_data.metadata.get("source_digest") == source_digest(json_path)
+
+
+def _load_packed(json_path: Path) -> Optional[PackedData]:
+    """Load the packed `browsers.bin` file, if it is present and up-to-date.
+
+    Args:
+        json_path (Path): Path to the `browsers.jsonl` file the packed file must be created from.
+
+    Returns:
+        Optional[PackedData]: The columns of the packed file, or None if the packed file is
+            missing, outdated, empty or invalid.
+    """
+    try:
+        packed_path = find_browser_packed_path()
+        if not packed_path.is_file():
+            return None
+        packed_data = unpack(packed_path.read_bytes())
+        if not _packed_up_to_date(packed_data, json_path):
+            logger.warning("Ignoring outdated browsers.bin file.")
+            return None
+        return packed_data if packed_data.count else None
+    except Exception as exc:
+        logger.warning("Unable to load browsers.bin file.", exc_info=exc)
+        return None
+
+
 def load() -> list[BrowserUserAgentData]:
     """Load the included `browser.json` file into memory.
 
+    The packed `browsers.bin` file holds the same data and is much faster to load, so it is
+    preferred when present.
+
     Raises:
         FakeUserAgentError: If unable to load or parse the data.
 
@@ -74,8 +155,12 @@ def load() -> list[BrowserUserAgentData]:
     data = []
     try:
         json_path = find_browser_json_path()
-        for line in json_path.read_text().splitlines():
-            data.append(json.loads(line))
+        packed_data = _load_packed(json_path)
+        if packed_data is not None:
+            data = packed_data.records()
+        else:
+            for line in json_path.read_text().splitlines():
+                data.append(json.loads(line))
     except Exception as exc:
         raise FakeUserAgentError("Failed to load or parse browsers.json") from exc
 
@@ -85,3 +170,156 @@ def load() -> list[BrowserUserAgentData]:
     if not isinstance(data, list):
         raise FakeUserAgentError("Data is not a list", data)
     return data
+
+
+def _load_dataset() -> Sequence[BrowserUserAgentData]:
+    """Load the included data file into a `fake_useragent.dataset.ColumnarDataset`.
+
+    If the `FAKE_USERAGENT_DELTA` environment variable is set, the delta file it points to is
+    applied on top of the included data (see `fake_useragent.delta`).
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data or the delta.
+
+    Returns:
+        Sequence[BrowserUserAgentData]: The loaded dataset.
+    """
+    # Imported here, since these modules depend on this one.
+    from fake_useragent.dataset import ColumnarDataset, load_dataset  # noqa: PLC0415
+    from fake_useragent.delta import (  # noqa: PLC0415
+        DELTA_ENV_VAR,
+        apply_delta,
+        read_delta,
+    )
+
+    dataset = load_dataset()
+    delta_path = os.environ.get(DELTA_ENV_VAR)
+    if not delta_path:
+        return dataset
+
+    records = apply_delta(dataset, read_delta(delta_path))
+    if not records:
+        raise FakeUserAgentError(
+            "Data list is empty after applying the delta", delta_path
+        )
+    return ColumnarDataset.from_records(records)
+
+
+_shared_data: Optional[Sequence[BrowserUserAgentData]] = None
+_shared_data_lock = threading.Lock()
+
+
+def _reset_lock_in_child() -> None:
+    """Replace the shared data lock in a forked child, in case another thread held it."""
+    global _shared_data_lock  # noqa: PLW0603
+    _shared_data_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_lock_in_child)
+
+
+def get_shared_data() -> Sequence[BrowserUserAgentData]:
+    """Get the process-wide browser user agent data, loading it on first use.
+
+    Every `FakeUserAgent` instance references this same data, so the data file is only read and
+    parsed once per process. Loading is thread-safe: concurrent first calls load the data once.
+    The returned data is shared and must be treated as read-only.
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data.
+
+    Returns:
+        Sequence[BrowserUserAgentData]: The shared browser user agent data. This is a
+            `fake_useragent.dataset.ColumnarDataset` of the included data file, unless other
+            data was set with `set_shared_data()`.
+    """
+    global _shared_data  # noqa: PLW0603
+    data = _shared_data
+    if data is None:
+        with _shared_data_lock:
+            if _shared_data is None:
+                _shared_data = _load_dataset()
+            data = _shared_data
+    return data
+
+
+def set_shared_data(data: Iterable[BrowserUserAgentData]) -> None:
+    """Replace the process-wide browser user agent data with the given records.
+
+    Instances that already loaded their data (see `FakeUserAgent.warmup()`) keep using it.
+
+    Args:
+        data (Iterable[BrowserUserAgentData]): The records to share, following the
+            `BrowserUserAgentData` schema. Sequences, like a list or a
+            `fake_useragent.dataset.MappedDataset`, are shared as is. Other iterables are
+            converted to a list first.
+
+    Raises:
+        FakeUserAgentError: If the given data is empty.
+    """
+    global _shared_data  # noqa: PLW0603
+    if not isinstance(data, Sequence):
+        data = list(data)
+    if not data:
+        raise FakeUserAgentError("Data list is empty", data)
+
+    with _shared_data_lock:
+        _shared_data = data
+
+
+def reload_shared_data() -> Sequence[BrowserUserAgentData]:
+    """Load the included data file again and share it with instances.
+
+    Instances that already loaded their data (see `FakeUserAgent.warmup()`) keep using it.
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data.
+
+    Returns:
+        Sequence[BrowserUserAgentData]: The newly loaded shared browser user agent data.
+    """
+    global _shared_data  # noqa: PLW0603
+    data = _load_dataset()
+    with _shared_data_lock:
+        _shared_data = data
+    return data
+
+
+def preload_shared_data(freeze: bool = True) -> Sequence[BrowserUserAgentData]:
+    """Load the process-wide data in a layout suited for sharing with forked child processes.
+
+    Call this in the parent process before forking workers, eg. in an app module preloaded by
+    `gunicorn --preload` or before starting a `multiprocessing` pool with the "fork" start
+    method. The shared data is replaced with a `fake_useragent.dataset.BufferDataset`, which
+    keeps all records in one immutable buffer, so the children read the parent's copy of the
+    data instead of copying the memory pages by updating reference counts.
+
+    Instances created afterwards use this data. Create and `warmup()` them in the parent to
+    share their filter index as well. The random generators of unseeded instances are
+    reseeded in every child, so children never pick the same user agents.
+
+    Args:
+        freeze (bool, optional): If True, also call `gc.freeze()`, so the garbage collector of
+            the children never touches the objects created so far (which would copy their
+            memory pages as well). Defaults to True.
+
+    Raises:
+        FakeUserAgentError: If unable to load or parse the data.
+
+    Returns:
+        Sequence[BrowserUserAgentData]: The shared browser user agent data.
+    """
+    global _shared_data  # noqa: PLW0603
+    # Imported here, since the dataset module depends on this one.
+    from fake_useragent.dataset import BufferDataset  # noqa: PLC0415
+
+    data = get_shared_data()
+    if not isinstance(data, BufferDataset):
+        data = BufferDataset.from_records(data)
+        with _shared_data_lock:
+            _shared_data = data
+    if freeze:
+        gc.collect()
+        gc.freeze()
+    return data
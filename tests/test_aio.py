@@ -0,0 +1,60 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from fake_useragent import AsyncUserAgent, UserAgent, fake
+from fake_useragent.utils import get_shared_data
+
+
+class TestAio(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_aio_create(self):
+        async def main():
+            return await AsyncUserAgent.create(browsers=["Firefox"], os="Linux")
+
+        ua = asyncio.run(main())
+
+        self.assertIsInstance(ua, UserAgent)
+        self.assertIsNotNone(ua._dataset)
+        self.assertIn("Firefox", ua.firefox)
+        self.assertEqual(ua.getRandom["os"], "Linux")
+
+    def test_aio_warmup_in_executor(self):
+        async def main():
+            ua = AsyncUserAgent()
+            loop = asyncio.get_running_loop()
+            with mock.patch.object(
+                loop, "run_in_executor", wraps=loop.run_in_executor
+            ) as run_in_executor:
+                await ua.awarmup()
+                await ua.awarmup()
+            run_in_executor.assert_called_once_with(None, ua.warmup)
+
+        with mock.patch.object(fake, "get_shared_data", wraps=get_shared_data):
+            asyncio.run(main())
+
+    def test_aio_stream(self):
+        async def main():
+            ua = AsyncUserAgent(browsers=["Chrome", "Edge"])
+            count = 5
+            seen = []
+            async for useragent in ua:
+                seen.append(useragent)
+                if len(seen) == count:
+                    break
+            firefox = ua.stream("Firefox")
+            seen.append(await firefox.__anext__())
+            await firefox.aclose()
+            return ua, seen
+
+        ua, seen = asyncio.run(main())
+
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(seen[-1], ua.fallback)
+        allowed = {x["useragent"] for x in ua._filter_useragents()}
+        self.assertTrue(set(seen[:5]) <= allowed)
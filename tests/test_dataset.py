@@ -0,0 +1,208 @@
+import io
+import json
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from fake_useragent import UserAgent, packed, utils
+from fake_useragent.dataset import (
+    BufferDataset,
+    ColumnarDataset,
+    MappedDataset,
+    RecordDataset,
+    load_data_source,
+    load_dataset,
+)
+from fake_useragent.errors import FakeUserAgentError
+
+
+class TestDataset(unittest.TestCase):
+    def setUp(self):
+        self.records = utils.load()
+
+    def tearDown(self):
+        pass
+
+    def test_dataset_records(self):
+        dataset = RecordDataset(self.records)
+
+        self.assertEqual(len(dataset), len(self.records))
+        self.assertIs(dataset[3], self.records[3])
+        self.assertEqual(dataset.useragent(3), self.records[3]["useragent"])
+        self.assertEqual(
+            dataset.values("browser", [5, 1]),
+            [self.records[5]["browser"], self.records[1]["browser"]],
+        )
+
+    def test_dataset_columnar(self):
+        dataset = load_dataset()
+
+        self.assertIsInstance(dataset, ColumnarDataset)
+        self.assertEqual(len(dataset), len(self.records))
+        self.assertEqual(dataset[4], self.records[4])
+        self.assertEqual(dataset.to_list(), self.records)
+        self.assertIs(dataset.to_list(), dataset.to_list())
+        self.assertEqual(dataset.useragent(6), self.records[6]["useragent"])
+        # Every distinct string is only stored once.
+        first, *others = dataset.values("browser", range(len(dataset)))
+        same = others.index(first) + 1
+        self.assertIs(dataset[same]["browser"], dataset[0]["browser"])
+
+    def test_dataset_columnar_from_records(self):
+        records = [dict(record, device_brand=None) for record in self.records[:3]]
+        dataset = ColumnarDataset.from_records(records)
+
+        self.assertEqual(list(dataset), records)
+        self.assertEqual(dataset.values("device_brand", [0, 2]), [None, None])
+
+    def test_dataset_mapped(self):
+        dataset = MappedDataset()
+
+        self.assertEqual(len(dataset), len(self.records))
+        self.assertEqual(list(dataset), self.records)
+        self.assertEqual(dataset[-1], self.records[-1])
+        self.assertEqual(dataset.useragent(7), self.records[7]["useragent"])
+        for field in ["useragent", "percent", "device_brand", "os_version"]:
+            self.assertEqual(
+                dataset.values(field, [9, 2]),
+                [self.records[9][field], self.records[2][field]],
+            )
+        with pytest.raises(IndexError):
+            dataset[len(self.records)]  # noqa: B018
+
+    def test_dataset_buffer(self):
+        dataset = BufferDataset.from_records(self.records)
+
+        self.assertIsInstance(dataset._buffer, bytes)
+        self.assertEqual(len(dataset), len(self.records))
+        self.assertEqual(dataset[5], self.records[5])
+        self.assertEqual(dataset.useragent(8), self.records[8]["useragent"])
+        self.assertEqual(dataset.to_list(), self.records)
+        self.assertEqual(
+            dataset.select({"Firefox"}, {"Linux"}, {"desktop"}, 0.0, 0.0),
+            RecordDataset(self.records).select(
+                {"Firefox"}, {"Linux"}, {"desktop"}, 0.0, 0.0
+            ),
+        )
+        with pytest.raises(FakeUserAgentError):
+            BufferDataset(b"not a packed file")
+
+    def test_dataset_pickle(self):
+        for dataset in (MappedDataset(), BufferDataset.from_records(self.records[:5])):
+            restored = pickle.loads(pickle.dumps(dataset))
+            self.assertIs(type(restored), type(dataset))
+            self.assertEqual(list(restored), list(dataset))
+
+    def test_dataset_select(self):
+        filters = {
+            "browsers": {"Chrome", "Edge", "Mobile Safari"},
+            "os": {"Windows", "iOS"},
+            "types": {"desktop", "mobile"},
+            "min_version": 100.0,
+            "min_percentage": 0.001,
+        }
+        expected = RecordDataset(self.records).select(**filters)
+
+        self.assertTrue(expected)
+        self.assertEqual(MappedDataset().select(**filters), expected)
+        self.assertEqual(load_dataset().select(**filters), expected)
+
+    def test_dataset_distinct(self):
+        browsers = {record["browser"] for record in self.records}
+
+        self.assertIn("Chrome", browsers)
+        self.assertEqual(RecordDataset(self.records).distinct("browser"), browsers)
+        self.assertEqual(MappedDataset().distinct("browser"), browsers)
+        self.assertEqual(load_dataset().distinct("browser"), browsers)
+        self.assertEqual(
+            load_dataset().distinct("percent"), {x["percent"] for x in self.records}
+        )
+
+    def test_dataset_mapped_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "browsers.bin")
+            with pytest.raises(FakeUserAgentError):
+                MappedDataset(path)
+            path.write_bytes(b"")
+            with pytest.raises(FakeUserAgentError):
+                MappedDataset(path)
+            path.write_bytes(b"not a packed file")
+            with pytest.raises(FakeUserAgentError):
+                MappedDataset(path)
+
+    def test_dataset_mapped_outdated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "browsers.bin")
+            packed.write_packed(self.records[:10], path, {"source_digest": "0"})
+            with mock.patch(
+                "fake_useragent.dataset.find_browser_packed_path", return_value=path
+            ):
+                with pytest.raises(FakeUserAgentError):
+                    MappedDataset()
+            # Explicit paths are not checked against the included data.
+            self.assertEqual(len(MappedDataset(path)), len(self.records[:10]))
+
+    def test_dataset_mapped_user_agent(self):
+        original = utils.get_shared_data()
+        try:
+            utils.set_shared_data(MappedDataset())
+            ua = UserAgent(browsers=["Firefox"], os="Linux", weighted=True)
+            ua.warmup()
+        finally:
+            utils.set_shared_data(original)
+
+        self.assertIsInstance(ua._dataset, MappedDataset)
+        self.assertIn("Firefox", ua.firefox)
+        self.assertEqual(ua.getRandom["browser"], "Firefox")
+        self.assertEqual(ua.getFirefox["os"], "Linux")
+        self.assertEqual(len(ua.sample(10)), 10)
+        self.assertEqual(ua.getBrowser("Chrome")["useragent"], ua.fallback)
+
+    def test_dataset_load_data_source(self):
+        records = self.records[:5]
+        with tempfile.TemporaryDirectory() as tmp:
+            jsonl_path = Path(tmp, "browsers.jsonl")
+            jsonl_path.write_text(
+                "".join(json.dumps(record) + "\n" for record in records)
+            )
+            packed_path = Path(tmp, "browsers.bin")
+            packed.write_packed(records, packed_path)
+
+            for source in (jsonl_path, str(packed_path)):
+                dataset = load_data_source(source)
+                self.assertIsInstance(dataset, ColumnarDataset)
+                self.assertEqual(dataset.to_list(), records)
+
+            with open(packed_path, "rb") as f:
+                self.assertEqual(load_data_source(f).to_list(), records)
+
+        jsonl = io.BytesIO(b"".join(json.dumps(r).encode() + b"\n" for r in records))
+        self.assertEqual(load_data_source(jsonl).to_list(), records)
+
+        self.assertEqual(load_data_source(records).to_list(), records)
+        self.assertEqual(load_data_source(iter(records)).to_list(), records)
+        dataset = RecordDataset(records)
+        self.assertIs(load_data_source(dataset), dataset)
+
+    def test_dataset_load_data_source_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with pytest.raises(FakeUserAgentError):
+                load_data_source(Path(tmp, "missing.jsonl"))
+        with pytest.raises(FakeUserAgentError):
+            load_data_source(io.BytesIO(b"not json"))
+        with pytest.raises(FakeUserAgentError):
+            load_data_source(io.BytesIO(b""))
+        with pytest.raises(FakeUserAgentError):
+            load_data_source([])
+        with pytest.raises(FakeUserAgentError):
+            load_data_source([{"useragent": "Mozilla/5.0"}])
+        with pytest.raises(TypeError):
+            load_data_source(io.StringIO("{}"))
+        with pytest.raises(TypeError):
+            load_data_source(b"{}")
+        with pytest.raises(TypeError):
+            load_data_source(42)
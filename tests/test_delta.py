@@ -0,0 +1,121 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from fake_useragent import UserAgent, delta, utils
+from fake_useragent.errors import FakeUserAgentError
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def by_useragent(records):
+    return {record["useragent"]: record for record in records}
+
+
+class TestDelta(unittest.TestCase):
+    def setUp(self):
+        self.base = read_jsonl(FIXTURES / "base.jsonl")
+        self.updated = read_jsonl(FIXTURES / "updated.jsonl")
+        self.operations = delta.read_delta(FIXTURES / "delta.jsonl")
+
+    def tearDown(self):
+        pass
+
+    def test_delta_make(self):
+        self.assertEqual(delta.make_delta(self.base, self.updated), self.operations)
+        self.assertEqual(
+            [operation["op"] for operation in self.operations],
+            ["reweight", "add", "remove"],
+        )
+
+    def test_delta_make_unchanged(self):
+        self.assertEqual(delta.make_delta(self.base, self.base), [])
+
+    def test_delta_apply(self):
+        result = delta.apply_delta(self.base, self.operations)
+
+        self.assertEqual(by_useragent(result), by_useragent(self.updated))
+        # Existing records keep their position, added records come last.
+        self.assertEqual(result[0], self.base[0])
+        self.assertEqual(result[-1], self.updated[-1])
+
+    def test_delta_apply_does_not_modify_records(self):
+        original = [dict(record) for record in self.base]
+        delta.apply_delta(self.base, self.operations)
+
+        self.assertEqual(self.base, original)
+
+    def test_delta_apply_ignores_unknown_useragents(self):
+        operations = [
+            {"op": "remove", "useragent": "unknown"},
+            {"op": "reweight", "useragent": "unknown", "percent": 1.0},
+        ]
+
+        self.assertEqual(delta.apply_delta(self.base, operations), self.base)
+
+    def test_delta_apply_duplicates(self):
+        first, second = self.base[0], self.base[1]
+        duplicate = {**first, "percent": 0.5}
+        records = [first, second, duplicate]
+
+        reweighted = delta.apply_delta(
+            records,
+            [{"op": "reweight", "useragent": first["useragent"], "percent": 1.0}],
+        )
+        removed = delta.apply_delta(
+            records, [{"op": "remove", "useragent": first["useragent"]}]
+        )
+        replaced = delta.apply_delta(records, [{"op": "add", "record": duplicate}])
+
+        self.assertEqual(delta.apply_delta(records, []), records)
+        self.assertEqual(
+            [record["percent"] for record in reweighted], [1.0, second["percent"], 1.0]
+        )
+        self.assertEqual(removed, [second])
+        self.assertEqual(replaced, [duplicate, second])
+
+    def test_delta_apply_invalid(self):
+        with pytest.raises(FakeUserAgentError):
+            delta.apply_delta(self.base, [{"op": "rename"}])
+        with pytest.raises(FakeUserAgentError):
+            delta.apply_delta(self.base, [{"op": "remove"}])
+
+    def test_delta_write_and_read(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "delta.jsonl"
+            delta.write_delta(self.operations, path)
+
+            self.assertEqual(delta.read_delta(path), self.operations)
+
+    def test_delta_read_invalid(self):
+        with pytest.raises(FakeUserAgentError):
+            delta.read_delta(FIXTURES / "missing.jsonl")
+
+    def test_delta_env_var(self):
+        original = utils.get_shared_data()
+        removed, reweighted = self.base[1]["useragent"], self.base[2]["useragent"]
+        added = self.updated[-1]["useragent"]
+        try:
+            with mock.patch.dict(
+                os.environ, {delta.DELTA_ENV_VAR: str(FIXTURES / "delta.jsonl")}
+            ):
+                data = by_useragent(utils.reload_shared_data())
+
+            self.assertEqual(len(data), len(by_useragent(original)))
+            self.assertNotIn(removed, data)
+            self.assertIn(added, data)
+            self.assertEqual(data[reweighted]["percent"], self.updated[1]["percent"])
+            self.assertEqual(
+                UserAgent(browsers="Firefox", min_version=140.0).random, added
+            )
+        finally:
+            utils.set_shared_data(original)
@@ -1,8 +1,33 @@
+import copy
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from array import array
+from collections import Counter
+from pathlib import Path
+from unittest import mock
 
 import pytest
 
-from fake_useragent import FakeUserAgent, UserAgent, __version__, get_version
+from fake_useragent import (
+    FakeUserAgent,
+    UserAgent,
+    __version__,
+    fake,
+    get_version,
+    packed,
+)
+from fake_useragent.errors import FakeUserAgentError
+from fake_useragent.headers import CLIENT_HINTS_MIN_VERSION
+from fake_useragent.utils import get_shared_data
+
+FIXTURES = Path(__file__).parent / "fixtures"
 
 
 class TestFake(unittest.TestCase):
@@ -68,6 +93,657 @@ class TestFake(unittest.TestCase):
         ua = UserAgent()
         assert isinstance(ua.data_browsers, list)
 
+    def test_fake_lazy_load(self):
+        with mock.patch.object(fake, "get_shared_data", wraps=get_shared_data) as load:
+            ua = UserAgent(browsers=["Chrome"])
+            load.assert_not_called()
+
+            ua.warmup()
+            ua.warmup()
+            self.assertTrue(ua.chrome)
+            load.assert_called_once()
+
+        with mock.patch.object(fake, "get_shared_data", wraps=get_shared_data) as load:
+            ua = UserAgent()
+            self.assertTrue(ua.random)
+            load.assert_called_once()
+
+    def test_fake_lazy_load_keeps_eager_validation(self):
+        with mock.patch.object(fake, "get_shared_data") as load:
+            with pytest.raises(TypeError):
+                UserAgent(browsers=52)
+            load.assert_not_called()
+
+    def test_fake_shared_data_browsers(self):
+        self.assertIs(
+            UserAgent().data_browsers, UserAgent(browsers=["Chrome"]).data_browsers
+        )
+
+    def test_fake_set_data_browsers(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"])
+        other = UserAgent(browsers=["Chrome", "Firefox"])
+        records = [
+            record for record in get_shared_data() if record["browser"] == "Firefox"
+        ][:3]
+        ua.chrome  # noqa: B018
+
+        ua.data_browsers = records
+
+        self.assertEqual(ua.data_browsers, records)
+        self.assertIn(ua.random, [record["useragent"] for record in records])
+        self.assertIn(ua.getBrowser("random"), records)
+        with self.assertLogs("fake_useragent", level="WARNING"):
+            self.assertEqual(ua.chrome, ua.fallback)
+        self.assertEqual(len(ua.query(browser="Firefox")), len(records))
+        self.assertIs(other.data_browsers, get_shared_data().to_list())
+        restored = pickle.loads(pickle.dumps(ua))
+        self.assertEqual(restored.data_browsers, records)
+
+    def test_fake_weighted(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], weighted=True)
+        self.assertTrue(ua.weighted)
+
+        for _ in range(100):
+            self.assertIn(ua.getRandom["browser"], ["Chrome", "Firefox"])
+            self.assertEqual(ua.getBrowser("Firefox")["browser"], "Firefox")
+            self.assertIn(ua.getChrome["browser"], ["Chrome"])
+        self.assertEqual(ua.getBrowser("Opera")["useragent"], ua.fallback)
+
+    def test_fake_weighted_follows_percent(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], weighted=True)
+        expected = sum(x["percent"] for x in ua._filter_useragents("Chrome")) / sum(
+            x["percent"] for x in ua._filter_useragents()
+        )
+
+        draws = [ua.getRandom["browser"] for _ in range(20_000)]
+
+        self.assertAlmostEqual(draws.count("Chrome") / len(draws), expected, delta=0.02)
+
+    def test_fake_sample(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox", "Edge"])
+        allowed = {x["useragent"] for x in ua._filter_useragents()}
+        firefox = {x["useragent"] for x in ua._filter_useragents("Firefox")}
+        firefox_edge = firefox | {x["useragent"] for x in ua._filter_useragents("Edge")}
+
+        self.assertEqual(ua.sample(0), [])
+        self.assertEqual(len(ua.sample(1000)), 1000)
+        self.assertTrue(set(ua.sample(1000)) <= allowed)
+        self.assertTrue(set(ua.sample(100, "Firefox")) <= firefox)
+        self.assertTrue(set(ua.sample(100, ["Firefox", "Edge"])) <= firefox_edge)
+        self.assertTrue(set(ua.sample(100, weighted=True)) <= allowed)
+        self.assertTrue(set(ua.sample(100, "Firefox", weighted=True)) <= firefox)
+        self.assertTrue(
+            set(ua.sample(100, ["Firefox", "Edge"], weighted=True)) <= firefox_edge
+        )
+
+    def test_fake_sample_fallback(self):
+        ua = UserAgent(browsers=["Chrome"])
+        self.assertEqual(ua.sample(3, "Firefox"), [ua.fallback] * 3)
+
+    def test_fake_for_key(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"])
+        other = UserAgent(browsers=["Chrome", "Firefox"], seed=1, weighted=True)
+        firefox = {x["useragent"] for x in ua._filter_useragents("Firefox")}
+        keys = [f"session-{i}" for i in range(200)]
+
+        assigned = [ua.for_key(key) for key in keys]
+        self.assertEqual(assigned, [ua.for_key(key) for key in keys])
+        self.assertEqual(assigned, [other.for_key(key, weighted=False) for key in keys])
+        # The data lists popular user agents many times, so some strings repeat.
+        distinct = {x["useragent"] for x in ua._filter_useragents()}
+        self.assertGreater(len(set(assigned)), len(distinct) // 4)
+        self.assertTrue({ua.for_key(key, "Firefox") for key in keys} <= firefox)
+        weighted = [ua.for_key(key, weighted=True) for key in keys]
+        self.assertEqual(weighted, [other.for_key(key) for key in keys])
+        self.assertEqual(ua.for_key(("1.2.3.4", 8080)), ua.for_key(("1.2.3.4", 8080)))
+        self.assertEqual(ua.for_key("session-1", "Safari"), ua.fallback)
+
+    def test_fake_for_key_across_processes(self):
+        code = (
+            "from fake_useragent import UserAgent; "
+            "print(UserAgent(weighted=True).for_key('session-1'))"
+        )
+        outputs = {
+            subprocess.run(
+                [sys.executable, "-c", code],
+                capture_output=True,
+                check=True,
+                env={**os.environ, "PYTHONHASHSEED": hash_seed},
+                text=True,
+            ).stdout.strip()
+            for hash_seed in ("1", "2")
+        }
+        self.assertEqual(outputs, {UserAgent(weighted=True).for_key("session-1")})
+
+    def test_fake_rotation(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], seed=1)
+        pool = [x["useragent"] for x in ua._filter_useragents()]
+        rounds = 3
+
+        rotation = ua.rotation()
+        for _ in range(rounds):
+            self.assertCountEqual([next(rotation) for _ in pool], pool)
+        ordered = ua.rotation(shuffle=False)
+        self.assertEqual([next(ordered) for _ in range(len(pool) * 2)], pool * 2)
+        firefox = [x["useragent"] for x in ua._filter_useragents("Firefox")]
+        rotation = ua.rotation("Firefox")
+        self.assertCountEqual([next(rotation) for _ in firefox], firefox)
+
+        seeded = UserAgent(browsers=["Chrome", "Firefox"], seed=2).rotation()
+        rotation = UserAgent(browsers=["Chrome", "Firefox"], seed=2).rotation()
+        self.assertEqual(
+            [next(rotation) for _ in range(10)], [next(seeded) for _ in range(10)]
+        )
+
+    def test_fake_rotation_weighted(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], weighted=True)
+        records = ua._filter_useragents()
+        total = sum(x["percent"] for x in records)
+        rotation = ua.rotation()
+
+        counts = Counter(next(rotation) for _ in records)
+        # Each record is rounded up or down, a string listed n times is off by less than n.
+        expected = Counter()
+        duplicates = Counter(x["useragent"] for x in records)
+        for record in records:
+            expected[record["useragent"]] += len(records) * record["percent"] / total
+        for useragent, count in duplicates.items():
+            self.assertLess(abs(counts[useragent] - expected[useragent]), count)
+
+    def test_fake_rotation_fallback(self):
+        ua = UserAgent(browsers=["Chrome"])
+        rotation = ua.rotation("Firefox")
+        self.assertEqual([next(rotation) for _ in range(3)], [ua.fallback] * 3)
+
+    def test_fake_index_arrays(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"])
+        ua.chrome  # noqa: B018
+
+        # Picking from arrays never touches the reference counts of shared int objects.
+        self.assertIsInstance(ua._indices, array)
+        self.assertTrue(all(isinstance(i, array) for i in ua._browser_index.values()))
+        for pool in ua._pool_cache.values():
+            self.assertIsInstance(pool.indices, array)
+        self.assertIsInstance(ua.query(os="Windows")._pool.indices, array)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires os.fork")
+    def test_fake_fork_reseeds(self):
+        ua = UserAgent()
+        seeded = UserAgent(seed=1234)
+        ua.warmup()
+        seeded.warmup()
+
+        def child_draws(ua):
+            read_fd, write_fd = os.pipe()
+            pid = os.fork()
+            if pid == 0:  # pragma: no cover
+                os.write(write_fd, "\n".join(ua.sample(20)).encode())
+                os._exit(0)
+            os.close(write_fd)
+            with os.fdopen(read_fd) as f:
+                draws = f.read().split("\n")
+            os.waitpid(pid, 0)
+            return draws
+
+        self.assertNotEqual(child_draws(ua), child_draws(ua))
+        self.assertEqual(child_draws(seeded), child_draws(seeded))
+
+    def test_fake_query(self):
+        ua = UserAgent()
+        records = ua._filter_useragents()
+        min_version, max_version = 100.0, 120.0
+
+        def os_version_at_least(record, minimum):
+            version = record["os_version"]
+            return (
+                bool(version)
+                and version[0].isdigit()
+                and (tuple(int(part) for part in version.split(".")) >= minimum)
+            )
+
+        query = ua.query(
+            os="Android",
+            browser=["Chrome Mobile", "Samsung Internet"],
+            os_version_min="10",
+            min_version=min_version,
+            exclude={"device_brand": "Generic_Android"},
+        )
+        expected = [
+            record
+            for record in records
+            if record["os"] == "Android"
+            and record["browser"] in {"Chrome Mobile", "Samsung Internet"}
+            and os_version_at_least(record, (10,))
+            and record["browser_version_major_minor"] >= min_version
+            and record["device_brand"] != "Generic_Android"
+        ]
+        self.assertTrue(expected)
+        self.assertEqual(query.records(), expected)
+        self.assertEqual(len(query), len(expected))
+        self.assertEqual(list(query), [record["useragent"] for record in expected])
+        self.assertIn(query.random, list(query))
+        self.assertIn(query.getRandom, expected)
+        self.assertTrue(set(query.sample(20, weighted=True)) <= set(query))
+
+        desktop = ua.query(type="desktop", max_version=max_version)
+        self.assertEqual(
+            desktop.records(),
+            [
+                record
+                for record in records
+                if record["type"] == "desktop"
+                and record["browser_version_major_minor"] <= max_version
+            ],
+        )
+        self.assertEqual(len(ua.query()), len(records))
+
+    def test_fake_query_cache(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"])
+        first = ua.query(browser=["Chrome", "Firefox"], os="Windows")
+        info = ua.pool_cache_info()
+        second = ua.query(os=["Windows"], browser=("Firefox", "Chrome"))
+
+        self.assertIs(first._pool, second._pool)
+        self.assertEqual(ua.pool_cache_info().hits, info.hits + 1)
+
+    def test_fake_query_fallback(self):
+        ua = UserAgent(browsers=["Chrome"])
+        query = ua.query(browser="Firefox")
+
+        self.assertEqual(len(query), 0)
+        self.assertEqual(query.random, ua.fallback)
+        self.assertEqual(query.getRandom["useragent"], ua.fallback)
+        self.assertEqual(query.sample(2), [ua.fallback] * 2)
+
+    def test_fake_query_invalid(self):
+        ua = UserAgent()
+        with pytest.raises(ValueError):
+            ua.query(exclude={"useragent": "Mozilla"})
+        with pytest.raises(ValueError):
+            ua.query(os_version_min="Vista")
+
+    def test_fake_sample_invalid_n(self):
+        ua = UserAgent()
+        with pytest.raises(ValueError):
+            ua.sample(-1)
+        with pytest.raises(TypeError):
+            ua.sample(1.5)
+
+    def test_fake_seed(self):
+        def draws(ua):
+            return (
+                [ua.random for _ in range(20)]
+                + [ua.getBrowser(["Chrome", "Firefox"])["useragent"] for _ in range(20)]
+                + ua.sample(20)
+                + ua.sample(20, weighted=True)
+            )
+
+        self.assertEqual(draws(UserAgent(seed=42)), draws(UserAgent(seed=42)))
+        self.assertEqual(
+            draws(UserAgent(seed="abc", weighted=True)),
+            draws(UserAgent(seed="abc", weighted=True)),
+        )
+        self.assertNotEqual(draws(UserAgent(seed=1)), draws(UserAgent(seed=2)))
+
+    def test_fake_own_random_state(self):
+        random.seed(7)
+        expected = random.random()
+
+        random.seed(7)
+        ua = UserAgent(weighted=True)
+        ua.random  # noqa: B018
+        ua.sample(10)
+
+        self.assertEqual(random.random(), expected)
+
+    def test_fake_thread_local_random(self):
+        ua = UserAgent(thread_local=True)
+        generators = []
+
+        def draw():
+            generators.append(ua._get_random())
+            self.assertIs(ua._get_random(), generators[-1])
+            self.assertTrue(ua.random)
+
+        threads = [threading.Thread(target=draw) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(generator) for generator in generators}), 4)
+        self.assertNotIn(ua._random, generators)
+
+    def test_fake_thread_local_seed(self):
+        def draws(ua):
+            results = []
+            for _ in range(3):
+                thread = threading.Thread(target=lambda: results.append(ua.sample(10)))
+                thread.start()
+                thread.join()
+            return results
+
+        first = draws(UserAgent(seed=3, thread_local=True))
+
+        self.assertEqual(first, draws(UserAgent(seed=3, thread_local=True)))
+        self.assertNotEqual(first[0], first[1])
+
+    def test_fake_pool_cache(self):
+        ua = UserAgent(pool_cache_size=2)
+        chrome = ["Chrome", "Chrome Mobile", "Chrome Mobile iOS"]
+        ua.getBrowser(chrome)
+        ua.sample(1, browsers=chrome)
+        ua.getBrowser(["Chrome Mobile iOS", "Chrome", "Chrome Mobile"])
+        ua.getBrowser("Firefox")
+
+        info = ua.pool_cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 2)
+        self.assertEqual(info.currsize, 2)
+
+        ua.getRandom  # noqa: B018
+        self.assertEqual(ua.pool_cache_info().currsize, ua.pool_cache_info().maxsize)
+
+        ua.getBrowser(chrome)
+        self.assertEqual(ua.pool_cache_info().misses, 4)
+
+    def test_fake_pool_cache_disabled(self):
+        ua = UserAgent(pool_cache_size=0)
+        ua.getBrowser("Chrome")
+        ua.getBrowser("Chrome")
+
+        info = ua.pool_cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.currsize, 0)
+
+    def test_fake_attribute_aliases(self):
+        ua = UserAgent()
+        chrome = {"Chrome", "Chrome Mobile", "Chrome Mobile iOS"}
+        useragents = {
+            record["useragent"]: record["browser"] for record in ua._filter_useragents()
+        }
+
+        self.assertIn(useragents[ua.chrome], chrome)
+        self.assertIn(useragents[ua["googlechrome"]], chrome)
+        self.assertIn(useragents[ua.CHROME], chrome)
+        self.assertIn(useragents[ua.ff], {"Firefox", "Firefox Mobile", "Firefox iOS"})
+        # Exact browser names only select that browser, other names are case-insensitive.
+        self.assertEqual(useragents[ua.Chrome], "Chrome")
+        self.assertEqual(useragents[ua["chrome mobile"]], "Chrome Mobile")
+        self.assertIn(ua.RANDOM, useragents)
+
+    def test_fake_attribute_filtered_out_browser(self):
+        ua = UserAgent(browsers=["Chrome Mobile"])
+
+        # An exact browser name excluded by the filters isn't resolved as an alias.
+        with self.assertLogs("fake_useragent", level="WARNING"):
+            self.assertEqual(ua["Chrome"], ua.fallback)
+        self.assertIn(ua.chrome, {x["useragent"] for x in ua._filter_useragents()})
+        self.assertEqual(ua.getBrowser("Chrome Mobile")["browser"], "Chrome Mobile")
+
+    def test_fake_attribute_negative_cache(self):
+        ua = UserAgent()
+        with self.assertLogs("fake_useragent", level="WARNING") as logs:
+            self.assertEqual(ua.non_existing, ua.fallback)
+            self.assertEqual(ua["non_existing"], ua.fallback)
+            self.assertEqual(ua.non_existing, ua.fallback)
+        self.assertEqual(len(logs.records), 1)
+        self.assertEqual(ua.pool_cache_info().misses, 1)
+
+    def test_fake_attribute_pool_cache(self):
+        ua = UserAgent(pool_cache_size=2)
+        ua.chrome  # noqa: B018
+        ua.chrome  # noqa: B018
+        ua["Firefox"]  # noqa: B018
+
+        info = ua.pool_cache_info()
+        self.assertEqual(info.misses, 2)
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.currsize, 2)
+
+        for idx in range(10):
+            self.assertEqual(ua[f"unknown_{idx}"], ua.fallback)
+        self.assertEqual(ua.pool_cache_info().currsize, 2)
+
+    def test_fake_copy(self):
+        ua = UserAgent(browsers=["Firefox"])
+        ua_copy = copy.copy(ua)
+        self.assertIn("Firefox", ua_copy.getRandom["browser"])
+
+        uninitialised = UserAgent.__new__(UserAgent)
+        with pytest.raises(AttributeError):
+            uninitialised.chrome  # noqa: B018
+
+    def test_fake_pickle(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], seed=1234, collect_stats=True)
+        ua.random  # noqa: B018
+        ua.headers()
+
+        for restored in (pickle.loads(pickle.dumps(ua)), copy.deepcopy(ua)):
+            self.assertEqual(restored.browsers, ua.browsers)
+            self.assertEqual(restored.stats().calls, {"random": 2})
+            self.assertEqual(restored.pool_cache_info().currsize, 0)
+            self.assertEqual(restored.sample(10), copy.deepcopy(ua).sample(10))
+            self.assertIn(restored.getRandom["browser"], {"Chrome", "Firefox"})
+
+        thread_local = pickle.loads(pickle.dumps(UserAgent(thread_local=True)))
+        self.assertIn(thread_local.random, {x["useragent"] for x in ua.data_browsers})
+
+    def test_fake_pickle_data_source(self):
+        records = [x for x in get_shared_data() if x["browser"] == "Firefox"][:3]
+        ua = UserAgent(data_source=records, browsers=["Firefox"], weighted=True)
+        ua.warmup()
+
+        restored = pickle.loads(pickle.dumps(ua))
+        self.assertIsNotNone(restored._dataset)
+        self.assertIn(restored.random, {x["useragent"] for x in records})
+
+    def test_fake_pool_cache_invalid_size(self):
+        with pytest.raises(ValueError):
+            UserAgent(pool_cache_size=-1)
+
+    def test_fake_pool_order(self):
+        ua = UserAgent()
+        browsers = ["Firefox", "Chrome"]
+
+        self.assertEqual(
+            ua._filter_useragents(browsers),
+            [
+                ua_data
+                for ua_data in ua._filter_useragents()
+                if ua_data["browser"] in browsers
+            ],
+        )
+
+    def test_fake_data_source(self):
+        records = [
+            record for record in get_shared_data() if record["browser"] == "Firefox"
+        ][:3]
+        ua = UserAgent(data_source=records)
+
+        self.assertIn(ua.random, [record["useragent"] for record in records])
+        self.assertEqual(len(ua.data_browsers), len(records))
+        self.assertGreater(len(UserAgent().data_browsers), len(records))
+
+    def test_fake_data_source_path_is_lazy(self):
+        ua = UserAgent(data_source=FIXTURES / "missing.jsonl")
+
+        with pytest.raises(FakeUserAgentError):
+            ua.warmup()
+        # Load errors are raised, not suppressed with the fallback user agent.
+        with pytest.raises(FakeUserAgentError):
+            ua.getBrowser("random")
+        with pytest.raises(FakeUserAgentError):
+            ua.headers()
+        with pytest.raises(FakeUserAgentError):
+            ua._get_useragent(["Chrome", "Firefox"])
+
+        ua = UserAgent(data_source=FIXTURES / "base.jsonl")
+        self.assertIsNone(ua._dataset)
+        self.assertIn(ua.random, (FIXTURES / "base.jsonl").read_text())
+
+    def test_fake_data_source_invalid(self):
+        with pytest.raises(TypeError):
+            UserAgent(data_source=42)
+        with pytest.raises(FakeUserAgentError):
+            UserAgent(data_source=iter([]))
+        with pytest.raises(FakeUserAgentError):
+            UserAgent(data_source=[{"useragent": "Mozilla/5.0"}])
+
+    def test_fake_snapshot(self):
+        ua = UserAgent(
+            browsers=["Chrome", "Edge"], platforms="desktop", min_version=120.0
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "snapshot.bin")
+            ua.save_snapshot(path)
+            with mock.patch.object(fake, "get_shared_data") as shared_data:
+                restored = UserAgent.from_snapshot(path, seed=1)
+            shared_data.assert_not_called()
+
+        self.assertEqual(restored.browsers, ua.browsers)
+        self.assertEqual(restored.platforms, ua.platforms)
+        self.assertEqual(restored.min_version, ua.min_version)
+        self.assertEqual(restored.seed, 1)
+        self.assertIsNotNone(restored._dataset)
+        self.assertEqual(restored._filter_useragents(), ua._filter_useragents())
+        self.assertEqual(
+            restored._filter_useragents("Edge"), ua._filter_useragents("Edge")
+        )
+        # The snapshot keeps the order of the user agents, so seeded picks are the same.
+        seeded = UserAgent(
+            browsers=["Chrome", "Edge"], platforms="desktop", min_version=120.0, seed=1
+        )
+        self.assertEqual(restored.sample(10), seeded.sample(10))
+
+    def test_fake_snapshot_invalid(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "snapshot.bin")
+            with pytest.raises(FakeUserAgentError):
+                UserAgent.from_snapshot(path)
+            packed.write_packed(get_shared_data().to_list()[:3], path)
+            with pytest.raises(FakeUserAgentError):
+                UserAgent.from_snapshot(path)
+
+    def test_fake_stats(self):
+        ua = UserAgent(collect_stats=True, min_version=120.0)
+        count = 5
+        ua.chrome  # noqa: B018
+        ua.chrome  # noqa: B018
+        ua.random  # noqa: B018
+        ua.getBrowser(["Edge", "Chrome"])
+        ua.sample(count, browsers="Firefox")
+        ua.non_existing  # noqa: B018
+        ua.getBrowser("Netscape")
+
+        stats = ua.stats()
+        self.assertEqual(
+            stats.calls,
+            {
+                "chrome": 2,
+                "random": 1,
+                "Edge,Chrome": 1,
+                "Firefox": 1,
+                "non_existing": 1,
+                "Netscape": 1,
+            },
+        )
+        self.assertEqual(stats.fallbacks, 2)
+        self.assertEqual(stats.pool_sizes["random"], len(ua._filter_useragents()))
+        self.assertEqual(
+            stats.pool_sizes["Firefox"], len(ua._filter_useragents("Firefox"))
+        )
+        self.assertEqual(stats.pool_sizes["non_existing"], 0)
+        self.assertEqual(stats.pool_sizes["Netscape"], 0)
+        self.assertGreater(stats.filter_time, 0.0)
+        self.assertGreater(stats.sample_time, 0.0)
+
+    def test_fake_stats_sample_time_excludes_filtering(self):
+        ua = UserAgent(collect_stats=True, pool_cache_size=0)
+        ua.warmup()
+        make_pool = ua._make_pool
+        delay = 0.02
+
+        def slow_make_pool(names):
+            time.sleep(delay)
+            return make_pool(names)
+
+        with mock.patch.object(ua, "_make_pool", side_effect=slow_make_pool):
+            ua.getBrowser("Chrome")
+            ua.headers("Chrome")
+            ua.sample(3, "Chrome")
+            ua.for_key("session-1", "Chrome")
+            ua.random  # noqa: B018
+            ua.chrome  # noqa: B018
+
+        stats = ua.stats()
+        calls = 6
+        self.assertGreaterEqual(stats.filter_time, calls * delay)
+        self.assertLess(stats.sample_time, delay)
+
+    def test_fake_stats_disabled(self):
+        ua = UserAgent()
+        ua.random  # noqa: B018
+
+        self.assertIsNone(ua.stats())
+
+    def test_fake_stats_hook(self):
+        events = []
+        ua = UserAgent(on_pick=events.append)
+        count = 3
+        ua.firefox  # noqa: B018
+        ua.sample(count)
+        ua["non_existing"]  # noqa: B018
+
+        self.assertEqual(
+            [(event.key, event.count, event.fallback) for event in events],
+            [
+                ("firefox", 1, False),
+                ("random", count, False),
+                ("non_existing", 1, True),
+            ],
+        )
+        self.assertTrue(all(event.duration >= 0.0 for event in events))
+        self.assertEqual(ua.stats().fallbacks, 1)
+
+    def test_fake_headers(self):
+        ua = UserAgent(
+            browsers=["Chrome", "Firefox"], os="Windows", platforms="desktop"
+        )
+        useragents = {record["useragent"]: record for record in ua._filter_useragents()}
+
+        for _ in range(20):
+            headers = ua.headers()
+            record = useragents[headers["User-Agent"]]
+            if (
+                record["browser"] == "Chrome"
+                and record["browser_version_major_minor"] >= CLIENT_HINTS_MIN_VERSION
+            ):
+                self.assertEqual(headers["Sec-CH-UA-Platform"], '"Windows"')
+                self.assertIn(
+                    record["browser_version"].split(".")[0], headers["Sec-CH-UA"]
+                )
+            else:
+                self.assertNotIn("Sec-CH-UA", headers)
+            self.assertEqual(headers["Accept-Language"], "en-US,en;q=0.9")
+
+        self.assertEqual(len(ua._headers_cache), len(set(ua._headers_cache)))
+        self.assertLessEqual(len(ua._headers_cache), len(useragents))
+        headers = ua.headers("Firefox", accept_language="fr")
+        headers["X-Test"] = "1"
+        self.assertEqual(
+            ua.headers("Firefox", accept_language="fr")["Accept-Language"], "fr"
+        )
+        self.assertNotIn("X-Test", ua.headers("Firefox"))
+
+    def test_fake_headers_fallback(self):
+        ua = UserAgent(browsers="Firefox")
+        headers = ua.headers("Chrome")
+
+        self.assertEqual(headers["User-Agent"], ua.fallback)
+        self.assertIn("Microsoft Edge", headers["Sec-CH-UA"])
+        self.assertEqual(headers["Sec-CH-UA-Platform"], '"Windows"')
+
     def test_fake_fallback(self):
         fallback = (
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -90,6 +766,35 @@ class TestFake(unittest.TestCase):
         self.assertIsInstance(ua.getBrowser("non_existing"), dict)
         self.assertEqual(ua.getBrowser("non_existing").get("useragent"), fallback)
 
+    def test_fake_filtered_index(self):
+        ua = UserAgent(browsers=["Chrome", "Firefox"], os="Windows", min_version=120.0)
+        expected = [
+            x
+            for x in ua.data_browsers
+            if x["browser"] in ["Chrome", "Firefox"]
+            and x["os"] == "Windows"
+            and x["type"] in ["desktop", "mobile", "tablet"]
+            and x["browser_version_major_minor"] >= ua.min_version
+        ]
+
+        self.assertEqual(ua._filter_useragents(), expected)
+        self.assertEqual(
+            ua._filter_useragents("Firefox"),
+            [x for x in expected if x["browser"] == "Firefox"],
+        )
+        self.assertEqual(
+            ua._filter_useragents(["Chrome", "Opera"]), ua._filter_useragents("Chrome")
+        )
+
+        for _ in range(100):
+            self.assertIn(ua.getRandom, expected)
+            self.assertEqual(ua.getBrowser(["Firefox", "Opera"])["browser"], "Firefox")
+
+    def test_fake_filtered_out_browser_fallback(self):
+        ua = UserAgent(browsers=["Chrome"])
+        self.assertEqual(ua.getBrowser("Firefox")["useragent"], ua.fallback)
+        self.assertEqual(ua.getBrowser(["Firefox", "Safari"])["useragent"], ua.fallback)
+
     def test_fake_fallback_str_types(self):
         with pytest.raises(TypeError):
             UserAgent(fallback=True)
@@ -0,0 +1,131 @@
+import unittest
+
+from fake_useragent.headers import DEFAULT_ACCEPT_LANGUAGE, build_headers
+
+
+def record(useragent, browser, browser_version, os, type="desktop"):
+    return {
+        "useragent": useragent,
+        "percent": 1.0,
+        "type": type,
+        "device_brand": None,
+        "browser": browser,
+        "browser_version": browser_version,
+        "browser_version_major_minor": float(".".join(browser_version.split(".")[:2])),
+        "os": os,
+        "os_version": None,
+        "platform": "Win32",
+    }
+
+
+class TestHeaders(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_headers_chrome(self):
+        useragent = (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+        )
+        headers = build_headers(record(useragent, "Chrome", "131.0.0.0", "Windows"))
+
+        self.assertEqual(headers["User-Agent"], useragent)
+        self.assertEqual(
+            headers["Sec-CH-UA"],
+            '"Google Chrome";v="131", "Chromium";v="131", "Not_A Brand";v="24"',
+        )
+        self.assertEqual(headers["Sec-CH-UA-Mobile"], "?0")
+        self.assertEqual(headers["Sec-CH-UA-Platform"], '"Windows"')
+        self.assertIn("image/webp", headers["Accept"])
+        self.assertEqual(headers["Accept-Language"], DEFAULT_ACCEPT_LANGUAGE)
+
+    def test_headers_chrome_versions(self):
+        expected = {
+            120: '"Not_A Brand";v="8", "Chromium";v="120", "Google Chrome";v="120"',
+            124: '"Chromium";v="124", "Google Chrome";v="124", "Not-A.Brand";v="99"',
+        }
+        for version, sec_ch_ua in expected.items():
+            useragent = f"Mozilla/5.0 (X11; Linux x86_64) Chrome/{version}.0.0.0"
+            headers = build_headers(
+                record(useragent, "Chrome", f"{version}.0.0.0", "Linux")
+            )
+            self.assertEqual(headers["Sec-CH-UA"], sec_ch_ua)
+            self.assertEqual(headers["Sec-CH-UA-Platform"], '"Linux"')
+
+    def test_headers_edge_mobile(self):
+        useragent = (
+            "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/122.0.0.0 Mobile Safari/537.36 EdgA/122.0.0.0"
+        )
+        headers = build_headers(
+            record(useragent, "Edge Mobile", "122.0.0.0", "Android", "mobile")
+        )
+
+        self.assertEqual(
+            headers["Sec-CH-UA"],
+            '"Chromium";v="122", "Not(A:Brand";v="24", "Microsoft Edge";v="122"',
+        )
+        self.assertEqual(headers["Sec-CH-UA-Mobile"], "?1")
+        self.assertEqual(headers["Sec-CH-UA-Platform"], '"Android"')
+
+    def test_headers_old_chrome(self):
+        useragent = (
+            "Mozilla/5.0 (Linux; Android 8.0.0; Pixel 2) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/47.0.5173.1316 Mobile Safari/537.36"
+        )
+        old = build_headers(
+            record(useragent, "Chrome Mobile", "47.0.5173", "Android", "mobile")
+        )
+        first = build_headers(
+            record(
+                useragent.replace("47.0.5173.1316", "89.0.4389.90"),
+                "Chrome Mobile",
+                "89.0.4389",
+                "Android",
+                "mobile",
+            )
+        )
+
+        self.assertNotIn("Sec-CH-UA", old)
+        self.assertNotIn("Sec-CH-UA-Mobile", old)
+        self.assertNotIn("Sec-CH-UA-Platform", old)
+        self.assertIn("image/webp", old["Accept"])
+        self.assertIn('"Google Chrome";v="89"', first["Sec-CH-UA"])
+
+    def test_headers_chrome_on_ios(self):
+        useragent = (
+            "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+            "(KHTML, like Gecko) Chrome/120.0.0.0 Mobile/15E148 Safari/604.1"
+        )
+        headers = build_headers(
+            record(useragent, "Chrome Mobile", "120.0.0.0", "iOS", "mobile")
+        )
+
+        self.assertNotIn("Sec-CH-UA", headers)
+        self.assertNotIn("Sec-CH-UA-Mobile", headers)
+        self.assertNotIn("Sec-CH-UA-Platform", headers)
+
+    def test_headers_without_client_hints(self):
+        firefox = build_headers(
+            record("Mozilla/5.0 Firefox/133.0", "Firefox", "133.0", "Linux"),
+            accept_language="de-DE,de;q=0.9",
+        )
+        safari = build_headers(
+            record(
+                "Mozilla/5.0 CriOS/131.0 Safari/604.1",
+                "Chrome Mobile iOS",
+                "131.0",
+                "iOS",
+            ),
+            accept_language=None,
+        )
+
+        for headers in (firefox, safari):
+            self.assertNotIn("Sec-CH-UA", headers)
+            self.assertNotIn("Sec-CH-UA-Mobile", headers)
+            self.assertIn("text/html", headers["Accept"])
+        self.assertEqual(firefox["Accept-Language"], "de-DE,de;q=0.9")
+        self.assertNotIn("Accept-Language", safari)
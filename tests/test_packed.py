@@ -0,0 +1,127 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from fake_useragent import UserAgent, packed, utils
+from fake_useragent.errors import FakeUserAgentError
+
+
+class TestPacked(unittest.TestCase):
+    def setUp(self):
+        self.records = [
+            {
+                "useragent": "Mozilla/5.0 (X11; Linux x86_64) Firefox/133.0",
+                "percent": 0.5,
+                "type": "desktop",
+                "device_brand": None,
+                "browser": "Firefox",
+                "browser_version": "133.0",
+                "browser_version_major_minor": 133.0,
+                "os": "Linux",
+                "os_version": None,
+                "platform": "Linux x86_64",
+            },
+            {
+                "useragent": "Mozilla/5.0 (Linux; Android 14; K) Chrome/131.0.0.0 Mobile Safari/537.36 ✓",
+                "percent": 1.25,
+                "type": "mobile",
+                "device_brand": "Generic_Android",
+                "browser": "Chrome Mobile",
+                "browser_version": "131.0.0.0",
+                "browser_version_major_minor": 131.0,
+                "os": "Android",
+                "os_version": "14",
+                "platform": "Linux x86_64",
+            },
+        ]
+
+    def tearDown(self):
+        pass
+
+    def test_packed_roundtrip(self):
+        data = packed.unpack(packed.pack(self.records, {"source_size": 42}))
+
+        self.assertEqual(data.count, 2)
+        self.assertEqual(data.metadata, {"source_size": 42})
+        self.assertEqual(data.records(), self.records)
+        self.assertEqual(data.string(data.columns["browser"][1]), "Chrome Mobile")
+        self.assertIsNone(data.string(data.columns["device_brand"][0]))
+        # Shared values are only stored once in the string table.
+        self.assertEqual(len(data.strings()), 13)
+
+    def test_packed_zero_copy(self):
+        buffer = packed.pack(self.records)
+        data = packed.unpack(buffer, copy=False)
+
+        self.assertIsInstance(data.columns["percent"], memoryview)
+        self.assertEqual(data.records(), self.records)
+
+    def test_packed_write_read(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "browsers.bin")
+            packed.write_packed(self.records, path)
+            self.assertEqual(packed.read_packed(path), self.records)
+
+    def test_packed_invalid(self):
+        buffer = packed.pack(self.records)
+
+        with pytest.raises(FakeUserAgentError):
+            packed.unpack(b"JSON" + buffer[4:])
+        with pytest.raises(FakeUserAgentError):
+            packed.unpack(buffer[:-8])
+        with pytest.raises(FakeUserAgentError):
+            packed.unpack(buffer[:10])
+        with pytest.raises(FakeUserAgentError):
+            packed.pack([{"useragent": "incomplete"}])
+
+    def test_packed_invalid_metadata(self):
+        buffer = packed.pack(self.records, {"k": "abcd"})
+        metadata = b'{"k": "abcd"}'
+
+        for invalid in (b'{"k": "abcd  ', b'["k", "abcd"]', b'{"k": "\xff\xfe\xffd"}'):
+            with self.subTest(metadata=invalid):
+                self.assertEqual(len(invalid), len(metadata))
+                corrupt = buffer.replace(metadata, invalid)
+                with pytest.raises(FakeUserAgentError):
+                    packed.unpack(corrupt)
+                with tempfile.TemporaryDirectory() as tmp:
+                    path = Path(tmp, "browsers.bin")
+                    path.write_bytes(corrupt)
+                    with pytest.raises(FakeUserAgentError):
+                        UserAgent(data_source=path).warmup()
+
+    def test_packed_invalid_strings(self):
+        buffer = packed.pack(self.records)
+        data = packed.unpack(buffer)
+        useragent = self.records[0]["useragent"].encode("utf-8")
+
+        with pytest.raises(FakeUserAgentError):
+            data.string(len(data.string_offsets))
+        corrupt = packed.unpack(buffer.replace(useragent, b"\xff" + useragent[1:]))
+        with pytest.raises(FakeUserAgentError):
+            corrupt.records()
+        with pytest.raises(FakeUserAgentError):
+            corrupt.string(data.columns["useragent"][0])
+
+        # Swap the first two string offsets after the leading 0, so they decrease.
+        offsets = bytearray(buffer)
+        meta_size = packed._HEADER.unpack_from(buffer)[-1]
+        start = packed._align(packed._align(packed._HEADER.size) + meta_size) + 4
+        offsets[start : start + 8] = (
+            offsets[start + 4 : start + 8] + offsets[start : start + 4]
+        )
+        with pytest.raises(FakeUserAgentError):
+            packed.unpack(bytes(offsets))
+
+    def test_packed_included_data(self):
+        json_path = utils.find_browser_json_path()
+        data = packed.unpack(utils.find_browser_packed_path().read_bytes())
+
+        self.assertEqual(data.metadata["source_digest"], utils.source_digest(json_path))
+        self.assertEqual(
+            data.records(),
+            [json.loads(line) for line in json_path.read_text().splitlines()],
+        )
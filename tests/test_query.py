@@ -0,0 +1,58 @@
+import unittest
+
+from fake_useragent import utils
+from fake_useragent.dataset import RecordDataset
+from fake_useragent.query import BitmapIndex, version_tuple
+
+
+class TestQuery(unittest.TestCase):
+    def setUp(self):
+        self.dataset = RecordDataset(utils.load())
+
+    def tearDown(self):
+        pass
+
+    def test_version_tuple(self):
+        self.assertEqual(version_tuple("10.15.7"), (10, 15, 7))
+        self.assertEqual(version_tuple(13), (13,))
+        self.assertEqual(version_tuple(13.1), (13, 1))
+        self.assertEqual(version_tuple("11 beta"), (11,))
+        self.assertIsNone(version_tuple("Vista"))
+        self.assertIsNone(version_tuple(None))
+
+    def test_bitmap_index(self):
+        indices = list(range(0, len(self.dataset), 3))
+        index = BitmapIndex(self.dataset, indices)
+        browsers = self.dataset.values("browser", indices)
+        minimum = 120.0
+
+        self.assertEqual(index.indices(index.all), indices)
+        self.assertEqual(index.indices(0), [])
+        for browser in ["Chrome", "Firefox"]:
+            expected = [
+                idx for idx, value in zip(indices, browsers) if value == browser
+            ]
+            self.assertEqual(
+                index.indices(index.matching("browser", {browser})), expected
+            )
+        self.assertEqual(
+            index.indices(index.matching("browser", {"Chrome", "Firefox"})),
+            [
+                idx
+                for idx, value in zip(indices, browsers)
+                if value in {"Chrome", "Firefox"}
+            ],
+        )
+        self.assertEqual(index.matching("browser", {"Netscape"}), 0)
+        self.assertEqual(
+            index.indices(
+                index.matching_where(
+                    "browser_version_major_minor", lambda v: v >= minimum
+                )
+            ),
+            [
+                idx
+                for idx in indices
+                if self.dataset[idx]["browser_version_major_minor"] >= minimum
+            ],
+        )
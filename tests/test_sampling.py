@@ -0,0 +1,84 @@
+import random
+import unittest
+from collections import Counter
+
+import pytest
+
+from fake_useragent.sampling import (
+    AliasTable,
+    jump_hash,
+    stable_hash,
+    systematic_sample,
+)
+
+
+class TestSampling(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def tearDown(self):
+        pass
+
+    def test_alias_table_distribution(self):
+        weights = [1.0, 2.0, 3.0, 4.0, 0.0]
+        table = AliasTable(weights)
+        rng = random.Random(1234)
+
+        counts = Counter(table.draw(rng.random) for _ in range(100_000))
+
+        self.assertEqual(len(table), len(weights))
+        self.assertEqual(table.total, sum(weights))
+        self.assertNotIn(4, counts)
+        for idx, weight in enumerate(weights[:4]):
+            self.assertAlmostEqual(counts[idx] / 100_000, weight / 10.0, delta=0.01)
+
+    def test_alias_table_single_weight(self):
+        table = AliasTable([0.5])
+        self.assertEqual(table.draw(lambda: 0.999999), 0)
+
+    def test_alias_table_invalid_weights(self):
+        with pytest.raises(ValueError):
+            AliasTable([])
+        with pytest.raises(ValueError):
+            AliasTable([1.0, -1.0])
+        with pytest.raises(ValueError):
+            AliasTable([0.0, 0.0])
+
+    def test_systematic_sample(self):
+        weights = [1.0, 2.0, 3.0, 4.0, 0.0]
+        rng = random.Random(1234)
+        k = 25
+
+        for _ in range(100):
+            drawn = systematic_sample(weights, k, rng.random())
+            counts = Counter(drawn)
+            self.assertEqual(len(drawn), k)
+            self.assertEqual(drawn, sorted(drawn))
+            self.assertNotIn(4, counts)
+            for idx, weight in enumerate(weights):
+                expected = k * weight / sum(weights)
+                self.assertLess(abs(counts[idx] - expected), 1)
+
+        self.assertEqual(systematic_sample([0.0, 1.0, 0.0], 3, 0.999), [1, 1, 1])
+        self.assertEqual(systematic_sample([1.0], 0, 0.5), [])
+        with pytest.raises(ValueError):
+            systematic_sample([0.0], 1, 0.5)
+
+    def test_stable_hash(self):
+        self.assertEqual(stable_hash("abc"), 6455300059550759896)
+        self.assertEqual(stable_hash("abc"), stable_hash(b"abc"))
+        self.assertEqual(stable_hash(("1.2.3.4", 8080)), stable_hash(("1.2.3.4", 8080)))
+        self.assertNotEqual(stable_hash(1), stable_hash("2"))
+
+    def test_jump_hash(self):
+        buckets = 10
+        keys = [stable_hash(i) for i in range(10_000)]
+        before = [jump_hash(key, buckets) for key in keys]
+        after = [jump_hash(key, buckets + 1) for key in keys]
+
+        self.assertEqual(set(before), set(range(buckets)))
+        self.assertTrue(all(jump_hash(key, 1) == 0 for key in keys[:100]))
+        # Keys only ever move to the new bucket, and only about 1/11 of them do.
+        moved = [new for old, new in zip(before, after) if old != new]
+        self.assertEqual(set(moved), {buckets})
+        self.assertAlmostEqual(len(moved) / len(keys), 1 / (buckets + 1), delta=0.01)
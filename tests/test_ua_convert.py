@@ -0,0 +1,268 @@
+import gzip
+import json
+import random
+import sys
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "ua-converter"))
+# The converter has its own dependencies, see requirements_converter.txt. They are
+# installed in the "converter" tox environment.
+ua_convert = pytest.importorskip("ua_convert")
+
+
+DOCUMENT = b"""[
+    {"userAgent": "Mozilla/5.0 (X11; Linux x86_64)", "weight": 0.25, "deviceCategory": "desktop"},
+    {"nested": {"list": [1, 2, {"a": null}], "text": "caf\xc3\xa9 \\" ] \xe2\x82\xac"}},
+    12345, -2.5e-3, 0, true, false, null, "", [], {},
+    "\xf0\x9f\x98\x80"
+]"""
+
+
+def _chunked(data, sizes):
+    """Split data into chunks of the given sizes, until all data is used."""
+    position = 0
+    for size in sizes:
+        if position >= len(data):
+            return
+        yield data[position : position + size]
+        position += size
+
+
+def _record(useragent, percent, type="desktop", platform="Linux x86_64"):
+    return {
+        "useragent": useragent,
+        "percent": percent,
+        "type": type,
+        "device_brand": None,
+        "browser": "Firefox",
+        "browser_version": "133.0",
+        "browser_version_major_minor": 133.0,
+        "os": "Linux",
+        "os_version": None,
+        "platform": platform,
+    }
+
+
+class TestIterJsonArray(unittest.TestCase):
+    def setUp(self):
+        self.expected = json.loads(DOCUMENT)
+
+    def test_iter_json_array_whole(self):
+        items = list(ua_convert.iter_json_array([DOCUMENT]))
+
+        self.assertEqual(items, self.expected)
+
+    def test_iter_json_array_one_byte_chunks(self):
+        chunks = [DOCUMENT[i : i + 1] for i in range(len(DOCUMENT))]
+
+        items = list(ua_convert.iter_json_array(chunks))
+
+        self.assertEqual(items, self.expected)
+
+    def test_iter_json_array_random_chunks(self):
+        rng = random.Random(42)
+        for _ in range(50):
+            sizes = iter(lambda: rng.randint(1, 16), None)
+
+            items = list(ua_convert.iter_json_array(_chunked(DOCUMENT, sizes)))
+
+            self.assertEqual(items, self.expected)
+
+    def test_iter_json_array_numbers_split_across_chunks(self):
+        chunks = [b"[1", b"23", b", 2.", b"5e", b"1, -", b"7]"]
+
+        items = list(ua_convert.iter_json_array(chunks))
+
+        self.assertEqual(items, [123, 25.0, -7])
+
+    def test_iter_json_array_empty_and_trailing_comma(self):
+        self.assertEqual(list(ua_convert.iter_json_array([b" [ ] "])), [])
+        self.assertEqual(list(ua_convert.iter_json_array([b"[1,", b" 2,\n]"])), [1, 2])
+
+    def test_iter_json_array_malformed(self):
+        documents = [
+            b"",
+            b"{}",
+            b"[1 2]",
+            b"[1,",
+            b"[1, 2",
+            b"[1, tru",
+            b'[{"a": 1]',
+            b'["unterminated',
+        ]
+        for document in documents:
+            for chunks in (
+                [document],
+                [document[i : i + 1] for i in range(len(document))],
+            ):
+                with self.subTest(document=document, chunks=len(chunks)):
+                    with pytest.raises(ValueError):
+                        list(ua_convert.iter_json_array(chunks))
+
+    def test_iter_json_array_yields_before_end(self):
+        def chunks():
+            yield b"[1, 2, "
+            raise AssertionError("Read too far")
+
+        items = ua_convert.iter_json_array(chunks())
+
+        self.assertEqual(next(items), 1)
+
+    def tearDown(self):
+        pass
+
+
+class TestGunzip(unittest.TestCase):
+    def setUp(self):
+        self.compressed = gzip.compress(DOCUMENT)
+
+    def test_gunzip_chunks(self):
+        rng = random.Random(42)
+        one_byte = [self.compressed[i : i + 1] for i in range(len(self.compressed))]
+        random_sizes = _chunked(self.compressed, iter(lambda: rng.randint(1, 64), None))
+
+        for chunks in ([self.compressed], one_byte, list(random_sizes)):
+            with self.subTest(chunks=len(chunks)):
+                self.assertEqual(b"".join(ua_convert._gunzip(chunks)), DOCUMENT)
+
+    def test_gunzip_to_json_array(self):
+        chunks = [self.compressed[i : i + 7] for i in range(0, len(self.compressed), 7)]
+
+        items = list(ua_convert.iter_json_array(ua_convert._gunzip(chunks)))
+
+        self.assertEqual(items, json.loads(DOCUMENT))
+
+    def test_gunzip_invalid(self):
+        with pytest.raises(zlib.error):
+            list(ua_convert._gunzip([b"not gzipped data"]))
+
+    def test_gunzip_truncated(self):
+        chunks = [self.compressed[: len(self.compressed) // 2]]
+
+        with pytest.raises(ValueError):
+            list(ua_convert.iter_json_array(ua_convert._gunzip(chunks)))
+
+    def tearDown(self):
+        pass
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name, "cache.sqlite3")
+
+    def test_parse_cache_round_trip(self):
+        cache = ua_convert.ParseCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", '{"browser": "Firefox"}')
+        cache.put("skipped", "null")
+        cache.close()
+
+        cache = ua_convert.ParseCache(self.path)
+        self.assertEqual(cache.get("a"), '{"browser": "Firefox"}')
+        self.assertEqual(cache.get("skipped"), "null")
+        self.assertIsNone(cache.get("b"))
+        cache.close()
+
+        expected_hits = 2
+        self.assertEqual(cache.hits, expected_hits)
+        self.assertEqual(cache.misses, 1)
+
+    def test_parse_cache_cleared_on_version_change(self):
+        cache = ua_convert.ParseCache(self.path)
+        cache.put("a", "null")
+        cache.close()
+
+        with mock.patch.object(ua_convert.ParseCache, "VERSION", "changed"):
+            cache = ua_convert.ParseCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.close()
+
+        with mock.patch.object(ua_convert, "_parser_version", return_value="0:0"):
+            cache = ua_convert.ParseCache(self.path)
+        cache.put("a", "null")
+        cache.close()
+        cache = ua_convert.ParseCache(self.path)
+        self.assertIsNone(cache.get("a"))
+        cache.close()
+
+    def test_parse_cache_convert(self):
+        item = {
+            "userAgent": "Mozilla/5.0 (X11; Linux x86_64; rv:133.0) Gecko/20100101 Firefox/133.0",
+            "weight": 0.5,
+            "deviceCategory": "desktop",
+            "platform": "Linux x86_64",
+        }
+        cache = ua_convert.ParseCache(self.path)
+        uncached = list(ua_convert.convert_useragents_formats([item], cache=cache))
+        cache.close()
+
+        cache = ua_convert.ParseCache(self.path)
+        cached = list(ua_convert.convert_useragents_formats([item], cache=cache))
+        cache.close()
+
+        self.assertEqual(cached, uncached)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TestAggregateUseragents(unittest.TestCase):
+    def setUp(self):
+        pass
+
+    def test_aggregate_merges_duplicates(self):
+        records = [
+            _record("a", 0.5),
+            _record("b", 1.0),
+            _record("a", 0.25, type="mobile", platform="Linux armv8l"),
+            _record("a", 0.5, type="mobile", platform="Linux armv8l"),
+        ]
+
+        merged, removed = ua_convert.aggregate_useragents(records)
+
+        self.assertEqual([record["useragent"] for record in merged], ["a", "b"])
+        self.assertEqual(merged[0]["percent"], 1.25)
+        self.assertEqual(merged[0]["type"], "mobile")
+        self.assertEqual(merged[0]["platform"], "Linux armv8l")
+        self.assertEqual(merged[1], _record("b", 1.0))
+        expected_removed = 2
+        self.assertEqual(removed, expected_removed)
+
+    def test_aggregate_ties_go_to_first_value(self):
+        records = [
+            _record("a", 0.5, type="tablet", platform="iPad"),
+            _record("a", 0.5, type="mobile", platform="iPhone"),
+        ]
+
+        merged, removed = ua_convert.aggregate_useragents(records)
+
+        self.assertEqual(merged[0]["type"], "tablet")
+        self.assertEqual(merged[0]["platform"], "iPad")
+        self.assertEqual(merged[0]["percent"], 1.0)
+        self.assertEqual(removed, 1)
+
+    def test_aggregate_without_duplicates(self):
+        records = [_record("a", 0.5), _record("b", 0.5)]
+
+        merged, removed = ua_convert.aggregate_useragents(iter(records))
+
+        self.assertEqual(merged, records)
+        self.assertEqual(removed, 0)
+
+    def test_aggregate_does_not_modify_input(self):
+        first = _record("a", 0.5)
+
+        ua_convert.aggregate_useragents([first, _record("a", 0.5, type="mobile")])
+
+        self.assertEqual(first, _record("a", 0.5))
+
+    def tearDown(self):
+        pass
@@ -5,9 +5,16 @@ if sys.version_info >= (3, 10):
 else:
     import importlib_resources as ilr  # noqa: F401
 
+import gc
+import json
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+from unittest import mock
 
-from fake_useragent import utils
+from fake_useragent import packed, utils
+from fake_useragent.dataset import BufferDataset
 
 
 class TestUtils(unittest.TestCase):
@@ -32,3 +39,96 @@ class TestUtils(unittest.TestCase):
         self.assertIsInstance(data[0]["os"], str)
         self.assertIsInstance(data[0]["os_version"], str)
         self.assertIsInstance(data[0]["platform"], str)
+
+    def test_utils_load_without_packed(self):
+        with mock.patch.object(
+            utils, "find_browser_packed_path", return_value=Path("missing.bin")
+        ):
+            data = utils.load()
+
+        self.assertEqual(data, utils.load())
+
+    def test_utils_load_ignores_outdated_packed(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "browsers.bin")
+            packed.write_packed(utils.load()[:10], path, {"source_digest": "0"})
+            with mock.patch.object(
+                utils, "find_browser_packed_path", return_value=path
+            ):
+                data = utils.load()
+
+        self.assertGreater(len(data), 1000)
+
+    def test_utils_load_ignores_packed_of_same_size(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = Path(tmp, "browsers.jsonl")
+            records = utils.load()[:10]
+            json_path.write_text("".join(json.dumps(r) + "\n" for r in records))
+            path = Path(tmp, "browsers.bin")
+            packed.write_packed(
+                records, path, {"source_digest": utils.source_digest(json_path)}
+            )
+            with mock.patch.object(
+                utils, "find_browser_packed_path", return_value=path
+            ):
+                self.assertIsNotNone(utils._load_packed(json_path))
+                # Same size, different contents.
+                edited = json_path.read_text().replace("Mozilla", "mOZILLA", 1)
+                json_path.write_text(edited)
+                self.assertIsNone(utils._load_packed(json_path))
+
+    def test_utils_shared_data(self):
+        data = utils.get_shared_data()
+
+        self.assertIs(utils.get_shared_data(), data)
+        self.assertGreater(len(data), 1000)
+
+    def test_utils_shared_data_loads_once(self):
+        original = utils.get_shared_data()
+        try:
+            utils._shared_data = None
+            data = utils.load()
+            with mock.patch.object(utils, "_load_dataset", return_value=data) as load:
+                threads = [
+                    threading.Thread(target=utils.get_shared_data) for _ in range(8)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            load.assert_called_once()
+            self.assertIs(utils.get_shared_data(), data)
+        finally:
+            utils._shared_data = original
+
+    def test_utils_set_and_reload_shared_data(self):
+        original = utils.get_shared_data()
+        try:
+            records = utils.load()[:10]
+            utils.set_shared_data(records)
+            self.assertEqual(utils.get_shared_data(), records)
+
+            with self.assertRaises(utils.FakeUserAgentError):
+                utils.set_shared_data([])
+
+            reloaded = utils.reload_shared_data()
+            self.assertIs(utils.get_shared_data(), reloaded)
+            self.assertEqual(list(reloaded), list(original))
+        finally:
+            utils.set_shared_data(original)
+
+    def test_utils_preload_shared_data(self):
+        original = utils.get_shared_data()
+        try:
+            data = utils.preload_shared_data(freeze=False)
+            self.assertIsInstance(data, BufferDataset)
+            self.assertIs(utils.get_shared_data(), data)
+            self.assertEqual(list(data), list(original))
+            self.assertIs(utils.preload_shared_data(freeze=False), data)
+
+            utils.preload_shared_data()
+            self.assertGreater(gc.get_freeze_count(), 0)
+        finally:
+            gc.unfreeze()
+            utils.set_shared_data(original)
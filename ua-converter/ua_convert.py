@@ -4,22 +4,36 @@
 
 """Description: Convert the user-agents.json file to JSONlines and directly remaps the keys."""
 import argparse
+import codecs
 import gzip
+import itertools
 import json
-from collections.abc import Iterable
+import sqlite3
+import zlib
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from importlib import metadata
 from multiprocessing.pool import Pool
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from typing import Optional, TypedDict
+from typing import Any, Optional, TypedDict
 
 import requests
 from ua_parser import parse
 
-from fake_useragent.utils import BrowserUserAgentData, find_browser_json_path
+from fake_useragent.delta import make_delta, write_delta
+from fake_useragent.packed import write_packed
+from fake_useragent.utils import (
+    BrowserUserAgentData,
+    find_browser_json_path,
+    find_browser_packed_path,
+    source_digest,
+)
 
 DEFAULT_URL = (
     "https://raw.githubusercontent.com/intoli/user-agents/main/src/user-agents.json.gz"
 )
+CHUNK_SIZE = 64 * 1024
+"""Number of bytes to read from the source at once."""
 
 
 class SourceItem(TypedDict):
@@ -35,36 +49,156 @@ class SourceItem(TypedDict):
     """System name for the user agent."""
 
 
-def download_and_extract(source_url: str) -> list[SourceItem]:
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator[Any]:
+    """Incrementally parse a JSON array, yielding its elements as soon as they are complete.
+
+    Only the elements that are currently being parsed are kept in memory, so the size of the
+    array does not matter.
+
+    Args:
+        chunks (Iterable[bytes]): The UTF-8 encoded JSON document, in chunks of any size.
+
+    Raises:
+        ValueError: If the document is not a valid JSON array.
+
+    Yields:
+        Any: The decoded elements of the array.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    expected = "["  # The next token: "[", a "value" or a "," separator.
+
+    for chunk, final in itertools.chain(((c, False) for c in chunks), [(b"", True)]):
+        buffer += text_decoder.decode(chunk, final)
+        position = 0
+        while True:
+            position = _skip_whitespace(buffer, position)
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if expected == "[":
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array but got {char!r}")
+                position += 1
+                expected = "value"
+            elif char == "]" and expected in ("value", ","):
+                # A trailing comma is accepted as well, the source is trusted enough.
+                return
+            elif expected == ",":
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' but got {char!r}")
+                position += 1
+                expected = "value"
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break  # The element continues in the next chunk.
+                if not final and (end == len(buffer) or buffer[end] not in " \t\n\r,]"):
+                    # A number or literal might continue in the next chunk, eg. "2." + "5".
+                    break
+                yield item
+                position = end
+                expected = ","
+        buffer = buffer[position:]
+
+    raise ValueError("The JSON array is not terminated")
+
+
+def _skip_whitespace(text: str, position: int) -> int:
+    """Skip JSON whitespace.
+
+    Args:
+        text (str): The text to scan.
+        position (int): The position to start at.
+
+    Returns:
+        int: The position of the first non-whitespace character, or the length of the text.
+    """
+    while position < len(text) and text[position] in " \t\n\r":
+        position += 1
+    return position
+
+
+def _gunzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Incrementally decompress gzipped data.
+
+    Args:
+        chunks (Iterable[bytes]): The gzipped data, in chunks of any size.
+
+    Yields:
+        bytes: The decompressed data, in chunks.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)  # Expect a gzip header.
+    for chunk in chunks:
+        yield decompressor.decompress(chunk)
+    yield decompressor.flush()
+
+
+def download_and_extract(source_url: str) -> Iterator[SourceItem]:
     """Download the user-agents.json file from the given URL and extract it if necessary.
 
+    The file is downloaded, decompressed and parsed in a streaming fashion, so it is never fully
+    loaded into memory.
+
     Args:
         source_url (str): The URL to the user-agents.json file.
 
-    Returns:
-        list[SourceItem]: The source file loaded as a list of `SourceItem`s. In reality, the
-            returned elements have more keys than the `SourceItem` schema, but we only use the
-            keys defined in the schema.
+    Yields:
+        SourceItem: The items of the source file. In reality, the items have more keys than the
+            `SourceItem` schema, but we only use the keys defined in the schema.
     """
-    response = requests.get(source_url, timeout=10)
-    response.raise_for_status()
+    with requests.get(source_url, timeout=10, stream=True) as response:
+        response.raise_for_status()
 
-    if source_url.endswith(".gz"):
-        with NamedTemporaryFile("wb") as temp_file:
-            temp_file.write(response.content)
+        chunks = response.iter_content(CHUNK_SIZE)
+        if source_url.endswith(".gz"):
+            chunks = _gunzip(chunks)
+        yield from iter_json_array(chunks)
 
-            with gzip.open(temp_file.name, "rb") as intermediate:
-                contents = intermediate.read()
-    else:
-        contents = response.content
 
-    return json.loads(contents)
+def read_source(path: Path) -> Iterator[SourceItem]:
+    """Read the user-agents.json file from disk, extracting it if it is gzipped.
 
+    Like `download_and_extract`, the file is parsed in a streaming fashion.
 
-def process_item(item: SourceItem) -> Optional[BrowserUserAgentData]:
-    """Process a single item and return the transformed item."""
+    Args:
+        path (Path): The user-agents.json or user-agents.json.gz file.
+
+    Yields:
+        SourceItem: The items of the source file.
+    """
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        yield from iter_json_array(iter(lambda: f.read(CHUNK_SIZE), b""))
+
+
+class ParsedUserAgent(TypedDict):
+    """The fields of our format that are parsed from the user agent string."""
+
+    device_brand: Optional[str]
+    browser: str
+    browser_version: str
+    browser_version_major_minor: float
+    os: Optional[str]
+    os_version: Optional[str]
+
+
+def parse_useragent(useragent: str) -> Optional[ParsedUserAgent]:
+    """Parse a user agent string into the fields of our format.
+
+    Args:
+        useragent (str): The user agent string.
+
+    Returns:
+        Optional[ParsedUserAgent]: The parsed fields, or None if the user agent string should be
+            skipped.
+    """
     # Parse the user agent string
-    ua_result = parse(item["userAgent"])
+    ua_result = parse(useragent)
     # Example output:
     # Result(
     #     user_agent=UserAgent(
@@ -118,35 +252,259 @@ def process_item(item: SourceItem) -> Optional[BrowserUserAgentData]:
         os_version = None
 
     return {
-        "useragent": item["userAgent"],
-        "percent": item["weight"] * 100,
-        "type": item["deviceCategory"],
         "device_brand": ua_result.device.brand if ua_result.device else None,
-        "browser": ua_result.user_agent.family if ua_result.user_agent else None,
+        "browser": ua_result.user_agent.family,
         "browser_version": browser_version,
         "browser_version_major_minor": browser_version_major_minor,
         "os": ua_result.os.family if ua_result.os else None,
         "os_version": os_version,
+    }
+
+
+def to_record(item: SourceItem, parsed: ParsedUserAgent) -> BrowserUserAgentData:
+    """Combine a source item and its parsed user agent string into a record of our format.
+
+    Args:
+        item (SourceItem): The source item.
+        parsed (ParsedUserAgent): The parsed user agent string of the item.
+
+    Returns:
+        BrowserUserAgentData: The record.
+    """
+    return {
+        "useragent": item["userAgent"],
+        "percent": item["weight"] * 100,
+        "type": item["deviceCategory"],
+        "device_brand": parsed["device_brand"],
+        "browser": parsed["browser"],
+        "browser_version": parsed["browser_version"],
+        "browser_version_major_minor": parsed["browser_version_major_minor"],
+        "os": parsed["os"],
+        "os_version": parsed["os_version"],
         "platform": item["platform"],
     }
 
 
+def process_item(item: SourceItem) -> Optional[BrowserUserAgentData]:
+    """Process a single item and return the transformed item."""
+    parsed = parse_useragent(item["userAgent"])
+    if parsed is None:
+        return None  # Skip this user-agent string
+    return to_record(item, parsed)
+
+
+def _process_entry(
+    entry: tuple[SourceItem, Optional[str]],
+) -> tuple[Optional[BrowserUserAgentData], Optional[str]]:
+    """Process a single item, using its cached parse result if there is one.
+
+    Args:
+        entry (tuple[SourceItem, Optional[str]]): The item and its cached parse result, as
+            stored by `ParseCache`, or None if it is not cached.
+
+    Returns:
+        tuple[Optional[BrowserUserAgentData], Optional[str]]: The transformed item (None to skip
+            it), and the new parse result to cache (None if it was cached already).
+    """
+    item, cached = entry
+    if cached is None:
+        parsed = parse_useragent(item["userAgent"])
+        new = json.dumps(parsed)
+    else:
+        parsed = json.loads(cached)
+        new = None
+    return (None if parsed is None else to_record(item, parsed)), new
+
+
+class ParseCache:
+    """Persistent cache of parsed user agent strings, stored in a SQLite database.
+
+    Most of the source data is unchanged between updates, so caching the parse results makes
+    converting it again much faster. The cache is cleared automatically when the version of the
+    cache or of the user agent parser changes.
+
+    Args:
+        path (Path): The SQLite database file, created if it does not exist.
+    """
+
+    VERSION = "1"
+    """Version of the cached data, change it when `parse_useragent` changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS parsed (useragent TEXT PRIMARY KEY, result TEXT NOT NULL);
+            """
+        )
+        version = f"{self.VERSION}:{_parser_version()}"
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        if row is None or row[0] != version:
+            with self._connection:
+                self._connection.execute("DELETE FROM parsed")
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)", (version,)
+                )
+
+    def get(self, useragent: str) -> Optional[str]:
+        """Look up the parse result of a user agent string.
+
+        Args:
+            useragent (str): The user agent string.
+
+        Returns:
+            Optional[str]: The parse result as JSON (`"null"` for a skipped user agent string),
+                or None if it is not cached.
+        """
+        row = self._connection.execute(
+            "SELECT result FROM parsed WHERE useragent = ?", (useragent,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, useragent: str, result: str) -> None:
+        """Store the parse result of a user agent string. Stored results are committed on `close()`.
+
+        Args:
+            useragent (str): The user agent string.
+            result (str): The parse result as JSON.
+        """
+        self._connection.execute(
+            "INSERT OR REPLACE INTO parsed VALUES (?, ?)", (useragent, result)
+        )
+
+    def close(self) -> None:
+        """Commit the stored results and close the database."""
+        self._connection.commit()
+        self._connection.close()
+
+
+def _parser_version() -> str:
+    """Get the version of the user agent parser and its rules.
+
+    Returns:
+        str: The versions of the `ua-parser` and `ua-parser-builtins` distributions.
+    """
+    versions = []
+    for distribution in ("ua-parser", "ua-parser-builtins"):
+        try:
+            versions.append(metadata.version(distribution))
+        except metadata.PackageNotFoundError:
+            versions.append("unknown")
+    return ":".join(versions)
+
+
 def convert_useragents_formats(
     data: Iterable[SourceItem],
-) -> list[BrowserUserAgentData]:
+    chunksize: int = 256,
+    cache: Optional[ParseCache] = None,
+) -> Iterator[BrowserUserAgentData]:
     """Convert the lines in Intoli's format to a JSONL file in our format.
 
+    The items are converted by a pool of worker processes. Results are yielded in the original
+    order as soon as they are available, without collecting them all first.
+
     Args:
         data (Iterable[SourceItem]): The updated user agent data in Intoli's format,
             from their [user-agents](https://github.com/intoli/user-agents) library.
-
-    Returns:
-        list[BrowserUserAgentData]: The user agent data in our format.
+        chunksize (int, optional): Number of items sent to a worker process at once.
+            Defaults to 256.
+        cache (Optional[ParseCache], optional): Cache of parsed user agent strings. Only the
+            user agent strings that are not cached yet are parsed, and their results are added
+            to the cache. Defaults to None.
+
+    Yields:
+        BrowserUserAgentData: The user agent data in our format.
     """
     with Pool() as pool:
         print(f"Using pool with {pool._processes} processes.")  # type: ignore[reportAttributeAccessIssue]; Pool has this attribute.
-        results = pool.map(process_item, data)
-    return [result for result in results if result is not None]
+        # Pool.imap() consumes its whole input up front, so feed it in batches to keep the
+        # number of items in memory bounded.
+        batch_size = chunksize * pool._processes * 4  # type: ignore[reportAttributeAccessIssue]
+        items = iter(data)
+        while batch := list(itertools.islice(items, batch_size)):
+            if cache is None:
+                entries = [(item, None) for item in batch]
+            else:
+                entries = [(item, cache.get(item["userAgent"])) for item in batch]
+            results = pool.imap(_process_entry, entries, chunksize)
+            for item, (record, new) in zip(batch, results):
+                if cache is not None and new is not None:
+                    cache.put(item["userAgent"], new)
+                if record is not None:
+                    yield record
+
+
+def aggregate_useragents(
+    records: Iterable[BrowserUserAgentData],
+) -> tuple[list[BrowserUserAgentData], int]:
+    """Merge records with the same user agent string.
+
+    The source contains the same user agent string many times, with a different weight, device
+    category or platform. Merged records get the summed usage percentage, and the device type
+    and platform with the highest usage percentage. The other fields are parsed from the user
+    agent string, so they are the same for all duplicates.
+
+    Unlike the rest of the conversion, this is not streamed: a duplicate can appear anywhere in
+    the source, so one record per unique user agent string is kept in memory until all records
+    are read.
+
+    Args:
+        records (Iterable[BrowserUserAgentData]): The records to merge.
+
+    Returns:
+        tuple[list[BrowserUserAgentData], int]: The merged records, in the order the user agent
+            strings first appeared, and the number of records that were merged away.
+    """
+    merged: dict[str, BrowserUserAgentData] = {}
+    # Usage percentage per device type and per platform, only for duplicated user agents.
+    types: dict[str, Counter[str]] = {}
+    platforms: dict[str, Counter[str]] = {}
+    count = 0
+    for record in records:
+        count += 1
+        useragent = record["useragent"]
+        first = merged.get(useragent)
+        if first is None:
+            merged[useragent] = dict(record)  # type: ignore[assignment]
+            continue
+
+        if useragent not in types:
+            types[useragent] = Counter({first["type"]: first["percent"]})
+            platforms[useragent] = Counter({first["platform"]: first["percent"]})
+        types[useragent][record["type"]] += record["percent"]
+        platforms[useragent][record["platform"]] += record["percent"]
+        first["percent"] += record["percent"]
+
+    for useragent, type_percentages in types.items():
+        # Ties go to the value that appeared first.
+        merged[useragent]["type"] = type_percentages.most_common(1)[0][0]
+        merged[useragent]["platform"] = platforms[useragent].most_common(1)[0][0]
+
+    return list(merged.values()), count - len(merged)
+
+
+def read_jsonl(path: Path) -> Iterator[BrowserUserAgentData]:
+    """Read the records of a JSONL file one by one.
+
+    Args:
+        path (Path): The JSONL file.
+
+    Yields:
+        BrowserUserAgentData: The records.
+    """
+    with open(path, "r") as f:
+        for line in f:
+            yield json.loads(line)
 
 
 if __name__ == "__main__":
@@ -186,6 +544,34 @@ if __name__ == "__main__":
         type=Path,
     )
 
+    parser.add_argument(
+        "-p",
+        "--packed-output",
+        help=(
+            "Output packed binary file, holding the same data as the JSONL file. "
+            "Default overwrites current package file (default: %(default)s)"
+        ),
+        default=find_browser_packed_path(),
+        type=Path,
+    )
+
+    parser.add_argument(
+        "--delta-from",
+        help=(
+            "Also write the delta between this previous JSONL file and the new data, "
+            "eg. the current package file"
+        ),
+        default=None,
+        type=Path,
+    )
+
+    parser.add_argument(
+        "--delta-output",
+        help="Output delta file, used with --delta-from (default: %(default)s)",
+        default=Path("browsers-delta.jsonl"),
+        type=Path,
+    )
+
     parser.add_argument(
         "-l",
         "--parse-limit",
@@ -194,25 +580,85 @@ if __name__ == "__main__":
         type=lambda limit: None if limit is None else int(limit),
     )
 
+    parser.add_argument(
+        "--cache",
+        help=(
+            "Cache parsed user agent strings in this SQLite file, so later runs only parse "
+            "new user agent strings (default: %(const)s)"
+        ),
+        nargs="?",
+        const=Path("ua-parse-cache.sqlite3"),
+        type=Path,
+    )
+
+    parser.add_argument(
+        "-k",
+        "--keep-duplicates",
+        help="Keep every source item, instead of merging items with the same user agent string",
+        action="store_true",
+    )
+
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        help="How many items to send to a worker process at once (default: %(default)s)",
+        default=256,
+        type=int,
+    )
+
     args = parser.parse_args()
 
     if args.download:
-        print(f"Downloading data from {args.download}")
+        print(f"Streaming data from {args.download}")
         data = download_and_extract(args.download)
     else:
-        print(f"Reading data from {args.input}")
-        with open(args.input, "r") as f:
-            data = json.load(f)
+        print(f"Streaming data from {args.input}")
+        data = read_source(args.input)
 
     if args.parse_limit:
         print(f"Parsing only the first {args.parse_limit} items")
-        data = data[: args.parse_limit]
-
-    print("Processing data...")
-    jsonl_converted = convert_useragents_formats(data)
-
-    print(f"Writing data to {args.output}")
-    with open(args.output, "w") as f:
-        for item in jsonl_converted:
-            f.write(json.dumps(item) + "\n")
+        data = itertools.islice(data, args.parse_limit)
+
+    previous = None
+    if args.delta_from:
+        # Read it up front, since it is likely the output file that is overwritten below.
+        print(f"Reading previous data from {args.delta_from}")
+        previous = list(read_jsonl(args.delta_from))
+
+    cache = None
+    if args.cache:
+        print(f"Using parse cache {args.cache}")
+        cache = ParseCache(args.cache)
+
+    print(f"Processing data and writing it to {args.output}")
+    count = 0
+    try:
+        converted: Iterable[BrowserUserAgentData] = convert_useragents_formats(
+            data, args.chunksize, cache
+        )
+        if not args.keep_duplicates:
+            converted, removed = aggregate_useragents(converted)
+            print(f"Merged {removed} duplicate user agents")
+        with open(args.output, "w") as f:
+            for item in converted:
+                f.write(json.dumps(item) + "\n")
+                count += 1
+    finally:
+        if cache is not None:
+            cache.close()
+    print(f"Wrote {count} user agents")
+    if cache is not None:
+        print(f"Parse cache: {cache.hits} hits, {cache.misses} misses")
+
+    print(f"Writing packed data to {args.packed_output}")
+    write_packed(
+        read_jsonl(args.output),
+        args.packed_output,
+        # Lets the package detect a packed file that is out of sync with the JSONL file.
+        metadata={"source_digest": source_digest(args.output)},
+    )
+    if previous is not None:
+        delta = make_delta(previous, read_jsonl(args.output))
+        print(f"Writing delta with {len(delta)} changes to {args.delta_output}")
+        write_delta(delta, args.delta_output)
     print("Done!")